@@ -1,36 +1,189 @@
 from __future__ import annotations
 
+import asyncio
+import importlib.machinery
+import importlib.metadata
+import json
 import os
 import subprocess
+import sys
 import tempfile
 import uuid
-from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
 from threading import Lock, Thread
-from typing import Deque, Optional
-
-from .commands import _build_env, _find_repo_root, build_calibration_cmd
+from typing import Iterable, Optional
+
+try:
+    import uvloop  # type: ignore
+except ImportError:  # Windows, or installed without uvicorn[standard]
+    uvloop = None
+
+from .commands import (
+    CALIBRATION_MODULE,
+    _build_env,
+    _find_repo_root,
+    build_calibration_args,
+    build_calibration_cmd,
+    clear_command_caches,
+)
 from .models import Robot
 
+READ_CHUNK_BYTES = 65536
+ENTER_PROMPT_MARKER = "press enter to use provided calibration file associated with the id"
+MAX_LOG_LINES = 400
+STDIN_TIMEOUT_SECONDS = 2.0
+SPAWN_TIMEOUT_SECONDS = 10.0
+
+# Opt-in: keep a spare interpreter (below) resident so calibrations after the first skip lerobot start-up.
+WARM_SPARE_ENV = "LEROBOT_WARM_CALIBRATION"
+
+# Pre-started interpreter for the next calibration: imports the calibration module (and lerobot's import
+# graph) ahead of time, then waits for one JSON line {"args": [...], "env": {...}} on stdin and runs the
+# module as __main__. The request is read from fd 0 unbuffered so later input()/select() prompts still
+# see everything written after it. EOF before a request means the panel is done with it.
+_SPARE_BOOTSTRAP = """
+import importlib, json, os, runpy, sys
+module = sys.argv[1]
+importlib.import_module(module)
+line = bytearray()
+while not line.endswith(b"\\n"):
+    byte = os.read(0, 1)
+    if not byte:
+        sys.exit(0)
+    line += byte
+request = json.loads(line)
+os.environ.update(request["env"])
+sys.argv = [module, *request["args"]]
+runpy.run_module(module, run_name="__main__", alter_sys=True)
+"""
+
+
+def _lerobot_fingerprint(env: dict[str, str]) -> Optional[tuple]:
+    """
+    Identity of the lerobot install the calibration subprocess would import (version and file stamps),
+    found without importing it, so a spare that imported an older install is not reused.
+    """
+    paths = [p for p in env.get("PYTHONPATH", "").split(os.pathsep) if p] + sys.path
+    try:
+        spec = importlib.machinery.PathFinder.find_spec("lerobot", paths)
+    except Exception:
+        return None
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    package = Path(next(iter(spec.submodule_search_locations)))
+    module_file = package.joinpath(*CALIBRATION_MODULE.split(".")[1:]).with_suffix(".py")
+    version = next((dist.version for dist in importlib.metadata.distributions(name="lerobot", path=paths)), None)
+    stamps = []
+    for path in (package, module_file):
+        try:
+            stamps.append(path.stat().st_mtime_ns)
+        except OSError:
+            stamps.append(None)
+    return (str(package), version, *stamps)
+
+
+class LogBuffer:
+    """
+    Fixed-size ring of log lines. Preallocates its slots so appends never allocate once full,
+    and snapshots are a single slice-concat instead of a linked-list walk.
+    """
+
+    def __init__(self, capacity: int = MAX_LOG_LINES) -> None:
+        self._capacity = capacity
+        self._buf: list = [None] * capacity
+        self._head = 0
+        self._size = 0
+        # lines ever appended, so readers can ask for what they haven't seen yet
+        self.total = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def append(self, line: str) -> None:
+        self._buf[self._head] = line
+        self._head = (self._head + 1) % self._capacity
+        if self._size < self._capacity:
+            self._size += 1
+        self.total += 1
+
+    def extend(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.append(line)
+
+    def snapshot(self) -> list[str]:
+        if self._size < self._capacity:
+            return self._buf[: self._size]
+        return self._buf[self._head :] + self._buf[: self._head]
+
+    def read(self) -> tuple[list[str], int]:
+        """Snapshot plus the total it corresponds to, consistent even while another thread appends."""
+        while True:
+            total = self.total
+            lines = self.snapshot()
+            if total == self.total:
+                return lines, total
+
+    def since(self, seen: int) -> tuple[Optional[list[str]], int]:
+        """
+        Lines appended after the first `seen` ones, plus the new total.
+        The lines are None when some of them were already overwritten (caller needs a full snapshot).
+        """
+        lines, total = self.read()
+        new = total - seen
+        if new < 0 or new > len(lines):
+            return None, total
+        return (lines[len(lines) - new :] if new else []), total
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("log index out of range")
+        start = 0 if self._size < self._capacity else self._head
+        return self._buf[(start + index) % self._capacity]
+
 
 @dataclass
 class CalibrationSessionState:
     id: str
     robot_id: str
-    logs: Deque[str] = field(default_factory=lambda: deque(maxlen=400))
-    process: Optional[subprocess.Popen[str]] = None
+    logs: LogBuffer = field(default_factory=LogBuffer)
+    process: Optional[asyncio.subprocess.Process] = None
     enter_flag: Optional[Path] = None
+    enter_flag_created: bool = False
     running: bool = False
     return_code: Optional[int] = None
     dry_run: bool = False
     ranges: dict[str, dict] = field(default_factory=dict)
+    # (event loop, asyncio.Event) per websocket watching this session; set from whichever thread changed it
+    _watchers: list = field(default_factory=list, repr=False)
+
+    def watch(self) -> asyncio.Event:
+        """Event (bound to the running loop) that is set whenever logs, ranges or process state change."""
+        event = asyncio.Event()
+        self._watchers.append((asyncio.get_running_loop(), event))
+        return event
+
+    def unwatch(self, event: asyncio.Event) -> None:
+        self._watchers[:] = [(loop, ev) for loop, ev in self._watchers if ev is not event]
+
+    def changed(self) -> None:
+        for loop, event in list(self._watchers):
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # watcher's loop already closed
 
     def snapshot(self) -> dict:
         return {
             "session_id": self.id,
             "robot_id": self.robot_id,
-            "logs": list(self.logs),
+            "logs": self.logs.snapshot(),
             "running": self.running,
             "return_code": self.return_code,
             "dry_run": self.dry_run,
@@ -40,19 +193,73 @@ class CalibrationSessionState:
 
 class CalibrationManager:
     def __init__(self) -> None:
+        # Single-key dict get/set/pop are atomic under the CPython GIL, so session lookups take no lock.
         self._sessions: dict[str, CalibrationSessionState] = {}
-        self._lock = Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = Lock()
+        # Only touched on the loop thread.
+        self._spare: Optional[asyncio.subprocess.Process] = None
+        # (env template, lerobot fingerprint) the spare was started with; a mismatch at launch retires it.
+        self._spare_tag: Optional[tuple] = None
+        self._replenish_task: Optional[asyncio.Task] = None
+        self.refresh_env()
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        One asyncio loop thread shared by every calibration subprocess: output reads, stdin writes
+        and exit waits all run here instead of two blocking threads per session.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                loop = self._new_loop()
+                Thread(target=loop.run_forever, daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    @staticmethod
+    def _new_loop() -> asyncio.AbstractEventLoop:
+        if sys.platform == "win32":
+            # Subprocess support needs the Proactor loop; uvicorn installs a Selector policy under --reload/--workers,
+            # so don't inherit whatever policy is current.
+            return asyncio.ProactorEventLoop()
+        # Same loop implementation uvicorn's default "auto" picks for the app when uvloop is installed.
+        return uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+
+    def _run_in_loop(self, coro, timeout: Optional[float] = None):
+        return asyncio.run_coroutine_threadsafe(coro, self._event_loop()).result(timeout)
+
+    def refresh_env(self) -> None:
+        """Recompute the cached subprocess env/cwd; call after mutating os.environ."""
+        root = _find_repo_root()
+        if root is not None and not root.exists():
+            # Checkout moved since the first lookup; look everything up again.
+            clear_command_caches()
+            root = _find_repo_root()
+        env = _build_env()
+        env["PYTHONUNBUFFERED"] = "1"
+        self._env_template = env
+        self._cwd = root or Path.cwd()
+        self._warm_spare = os.environ.get(WARM_SPARE_ENV, "").lower() in ("1", "true", "yes")
+        # Computed here rather than per launch, so checking the spare costs a tuple comparison.
+        self._lerobot_fingerprint = _lerobot_fingerprint(env) if self._warm_spare else None
+        if self._loop is not None:
+            # The spare was started with the old env/cwd (or is no longer wanted).
+            asyncio.run_coroutine_threadsafe(self._retire_spare(), self._loop)
 
     def _write_stdin(self, state: CalibrationSessionState, data: str) -> bool:
         payload = data if data.endswith("\n") else f"{data}\n"
+        if not state.process or not state.process.stdin:
+            return False
         try:
-            if state.process and state.process.stdin:
-                state.process.stdin.write(payload)
-                state.process.stdin.flush()
-                return True
+            self._run_in_loop(self._write(state.process.stdin, payload.encode()), timeout=STDIN_TIMEOUT_SECONDS)
+            return True
         except Exception:
             return False
-        return False
+
+    @staticmethod
+    async def _write(stdin: asyncio.StreamWriter, payload: bytes) -> None:
+        stdin.write(payload)
+        await stdin.drain()
 
     def _write_stdin_newline(self, state: CalibrationSessionState) -> bool:
         return self._write_stdin(state, "")
@@ -62,7 +269,15 @@ class CalibrationManager:
         if not flag:
             return False
         try:
-            flag.touch()
+            if state.enter_flag_created:
+                # Already on disk: bump its mtime with one utime() instead of touch()'s open/close.
+                try:
+                    os.utime(flag, None)
+                    return True
+                except FileNotFoundError:
+                    pass  # consumed by the calibration script; recreate below
+            flag.touch(exist_ok=True)
+            state.enter_flag_created = True
             return True
         except OSError:
             return False
@@ -70,8 +285,8 @@ class CalibrationManager:
     def start(self, robot: Robot, *, dry_run: bool = False) -> CalibrationSessionState:
         session_id = uuid.uuid4().hex
         cmd = build_calibration_cmd(robot)
-        env = _build_env()
-        cwd = _find_repo_root() or Path.cwd()
+        env = dict(self._env_template)
+        cwd = self._cwd
         enter_flag = Path(tempfile.gettempdir()) / f"lerobot_enter_{session_id}.flag"
 
         state = CalibrationSessionState(
@@ -88,19 +303,13 @@ class CalibrationManager:
             self._store(state)
             return state
 
-        env["LEROBOT_ENTER_FLAG"] = str(enter_flag)
-        env["PYTHONUNBUFFERED"] = "1"
+        session_env = {"LEROBOT_ENTER_FLAG": str(enter_flag)}
+        env.update(session_env)
 
         try:
-            process = subprocess.Popen(
-                cmd,
-                env=env,
-                cwd=cwd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
+            process = self._run_in_loop(
+                self._launch(cmd, build_calibration_args(robot), env, cwd, session_env),
+                timeout=SPAWN_TIMEOUT_SECONDS,
             )
         except Exception as exc:
             state.logs.append(f"Failed to start calibration: {exc}")
@@ -113,46 +322,116 @@ class CalibrationManager:
         state.logs.append("Calibration process started. Waiting for device output...")
         self._store(state)
 
-        Thread(target=self._consume_output, args=(state,), daemon=True).start()
-        Thread(target=self._watch_process, args=(state,), daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self._pump(state), self._event_loop())
         return state
 
-    def _consume_output(self, state: CalibrationSessionState) -> None:
-        if not state.process or not state.process.stdout:
+    async def _launch(
+        self, cmd: list[str], args: list[str], env: dict[str, str], cwd: Path, session_env: dict[str, str]
+    ) -> asyncio.subprocess.Process:
+        """
+        Hand the session to the warm spare interpreter when one is ready, otherwise spawn cmd cold.
+        With WARM_SPARE_ENV set, start a fresh spare so the next calibration skips Python + lerobot start-up;
+        the first calibration always runs cold, so nothing stays resident for users who never calibrate.
+        """
+        process = None
+        spare, self._spare = self._spare, None
+        if spare is not None and self._spare_tag != self._current_spare_tag():
+            # Started with an older env/cwd, or lerobot was upgraded or moved since it imported it.
+            await self._retire(spare)
+            spare = None
+        if spare is not None and spare.returncode is None and spare.stdin is not None:
+            request = json.dumps({"args": args, "env": session_env})
+            try:
+                await self._write(spare.stdin, f"{request}\n".encode())
+                process = spare
+            except Exception:
+                await self._terminate(spare)
+        if process is None:
+            process = await self._spawn(cmd, env, cwd)
+        if self._warm_spare and (self._replenish_task is None or self._replenish_task.done()):
+            # Started after this session's process, so the spare's spawn isn't on the launch path.
+            self._replenish_task = asyncio.get_running_loop().create_task(self._replenish_spare())
+        return process
+
+    def _current_spare_tag(self) -> tuple:
+        return (self._env_template, self._cwd, self._lerobot_fingerprint)
+
+    async def _replenish_spare(self) -> None:
+        tag = self._current_spare_tag()
+        try:
+            spare = await self._spawn(
+                [sys.executable, "-u", "-c", _SPARE_BOOTSTRAP, CALIBRATION_MODULE], self._env_template, self._cwd
+            )
+        except Exception:
             return
-        buf = ""
-        while True:
-            chunk = state.process.stdout.read(1)
-            if chunk == "":
-                break
-            if chunk == "\r":
-                continue
-            if chunk == "\n":
-                self._handle_line(buf, state)
-                buf = ""
-                continue
-            buf += chunk
-            # Some prompts (like input()) don't end with a newline. Detect and flush them once we see the full prompt (ends with ':').
-            lowered = buf.lower()
-            if (
-                "press enter to use provided calibration file associated with the id" in lowered
-                and buf.strip().endswith(":")
-            ):
-                self._handle_line(buf, state)
-                buf = ""
-        if buf:
-            self._handle_line(buf, state)
-        if state.process.stdout:
-            state.process.stdout.close()
-
-    def _handle_line(self, line: str, state: CalibrationSessionState) -> None:
-        clean = line.strip()
-        if not clean:
+        if self._spare is not None or not self._warm_spare:
+            await self._retire(spare)
             return
-        state.logs.append(clean)
-        parsed = self._parse_range_line(clean)
-        if parsed:
-            state.ranges[parsed["name"]] = parsed
+        self._spare, self._spare_tag = spare, tag
+
+    @staticmethod
+    async def _spawn(cmd: list[str], env: dict[str, str], cwd: Path) -> asyncio.subprocess.Process:
+        return await asyncio.create_subprocess_exec(
+            *cmd,
+            env=env,
+            cwd=cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+
+    async def _retire_spare(self) -> None:
+        spare, self._spare = self._spare, None
+        if spare is not None:
+            await self._retire(spare)
+
+    @staticmethod
+    async def _retire(spare: asyncio.subprocess.Process) -> None:
+        if spare.stdin is not None:
+            # EOF before a request: the bootstrap exits on its own.
+            spare.stdin.close()
+
+    async def _pump(self, state: CalibrationSessionState) -> None:
+        proc = state.process
+        if not proc or not proc.stdout:
+            return
+        tail = bytearray()
+        try:
+            while True:
+                chunk = await proc.stdout.read(READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                tail = self._feed_output(state, tail + chunk)
+        except Exception:
+            pass
+        if tail:
+            self._handle_lines([tail.decode("utf-8", "replace")], state)
+        await proc.wait()
+        self._on_exit(state)
+
+    def _feed_output(self, state: CalibrationSessionState, buffered: bytearray) -> bytearray:
+        """Handle every complete line in buffered output and return the trailing partial line."""
+        *complete, rest = buffered.split(b"\n")
+        if complete:
+            self._handle_lines([line.decode("utf-8", "replace") for line in complete], state)
+        # Some prompts (like input()) don't end with a newline. Detect and flush them once we see the full prompt (ends with ':').
+        if rest:
+            pending = rest.decode("utf-8", "replace").replace("\r", "")
+            if ENTER_PROMPT_MARKER in pending.lower() and pending.strip().endswith(":"):
+                self._handle_lines([pending], state)
+                return bytearray()
+        return bytearray(rest)
+
+    def _handle_lines(self, lines: list[str], state: CalibrationSessionState) -> None:
+        cleaned = [clean for clean in (line.replace("\r", "").strip() for line in lines) if clean]
+        if not cleaned:
+            return
+        state.logs.extend(cleaned)
+        for clean in cleaned:
+            parsed = self._parse_range_line(clean)
+            if parsed:
+                state.ranges[parsed["name"]] = parsed
+        state.changed()
 
     def _parse_range_line(self, line: str) -> Optional[dict]:
         if "|" not in line:
@@ -171,12 +450,12 @@ class CalibrationManager:
             return None
         return {"name": name, "min": min_val, "pos": pos_val, "max": max_val}
 
-    def _watch_process(self, state: CalibrationSessionState) -> None:
+    def _on_exit(self, state: CalibrationSessionState) -> None:
         if not state.process:
             return
-        state.process.wait()
         state.return_code = state.process.returncode
         state.running = False
+        state.changed()
         try:
             if state.enter_flag and state.enter_flag.exists():
                 state.enter_flag.unlink()
@@ -184,12 +463,10 @@ class CalibrationManager:
             pass
 
     def _store(self, state: CalibrationSessionState) -> None:
-        with self._lock:
-            self._sessions[state.id] = state
+        self._sessions[state.id] = state
 
     def get(self, session_id: str) -> Optional[CalibrationSessionState]:
-        with self._lock:
-            return self._sessions.get(session_id)
+        return self._sessions.get(session_id)
 
     def send_enter(self, session_id: str) -> tuple[bool, str]:
         state = self.get(session_id)
@@ -197,12 +474,13 @@ class CalibrationManager:
             return False, "Session not found."
         if state.dry_run:
             return False, "Dry-run session does not accept input."
-        if not state.process or state.process.poll() is not None:
+        if not state.process or state.process.returncode is not None:
             state.running = False
             return False, "Calibration process is not running."
 
         stdin_ok = self._write_stdin_newline(state)
         state.logs.append(f"[panel] start request (flag=False, stdin={stdin_ok})")
+        state.changed()
         if stdin_ok:
             return True, "ENTER sent."
         return False, "Failed to send ENTER (stdin unavailable)."
@@ -213,13 +491,14 @@ class CalibrationManager:
             return False, "Session not found."
         if state.dry_run:
             return False, "Dry-run session does not accept input."
-        if not state.process or state.process.poll() is not None:
+        if not state.process or state.process.returncode is not None:
             state.running = False
             return False, "Calibration process is not running."
 
         stdin_ok = self._write_stdin(state, data or "")
         pretty = (data or "ENTER").replace("\n", "\\n")
         state.logs.append(f"[panel] input {pretty} (stdin={stdin_ok})")
+        state.changed()
         if stdin_ok:
             return True, "Input sent."
         return False, "Failed to send input (stdin unavailable)."
@@ -230,13 +509,14 @@ class CalibrationManager:
             return False, "Session not found."
         if state.dry_run:
             return False, "Dry-run session does not accept input."
-        if not state.process or state.process.poll() is not None:
+        if not state.process or state.process.returncode is not None:
             state.running = False
             return False, "Calibration process is not running."
 
         flag_ok = self._touch_flag(state)
         stdin_ok = self._write_stdin_newline(state) if not flag_ok else False
         state.logs.append(f"[panel] stop request (flag={flag_ok}, stdin={stdin_ok})")
+        state.changed()
         if flag_ok or stdin_ok:
             return True, "Stop ENTER sent."
         return False, "Failed to send stop ENTER."
@@ -252,17 +532,14 @@ class CalibrationManager:
         if not proc:
             return False, "No process to cancel."
 
-        if proc.poll() is None:
+        if proc.returncode is None:
             try:
-                proc.terminate()
+                self._run_in_loop(self._terminate(proc), timeout=5)
             except Exception:
-                proc.kill()
-            try:
-                proc.wait(timeout=1)
-            except Exception:
-                proc.kill()
+                pass
         state.running = False
         state.return_code = proc.returncode
+        state.changed()
         try:
             if state.enter_flag and state.enter_flag.exists():
                 state.enter_flag.unlink()
@@ -270,6 +547,20 @@ class CalibrationManager:
             pass
         return True, "Calibration cancelled."
 
+    @staticmethod
+    async def _terminate(proc: asyncio.subprocess.Process) -> None:
+        try:
+            proc.terminate()
+        except ProcessLookupError:
+            return
+        except Exception:
+            proc.kill()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=1)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+
     def snapshot(self, session_id: str) -> Optional[dict]:
         state = self.get(session_id)
         if not state:
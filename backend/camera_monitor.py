@@ -1,14 +1,38 @@
 from __future__ import annotations
 
+import asyncio
+import importlib
+import math
 import re
+import sys
 import threading
 import time
-from dataclasses import asdict, dataclass
-from typing import Dict, List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from . import dshow_modes
+from .hotplug import PollBackoff, open_udev_monitor, wait_for_udev
+from .v4l2_modes import device_node, enumerate_modes
 
 POLL_SECONDS = 2.0
-# Keep probing snappy: fewer frames for FPS estimate and a short list of common modes.
+# With udev hotplug events available, still do a full rescan after this many quiet intervals as a safety net.
+IDLE_RESCAN_TICKS = 15
+# OpenCV captures and RealSense pipelines stay open per device until idle this long.
+CAPTURE_IDLE_SECONDS = 10.0
+# Frames discarded by a fresh OpenCV reader to avoid black images, and how long a snapshot waits for the first frame.
+WARMUP_FRAMES = 3
+FRAME_WAIT_SECONDS = 3.0
+# How long an opener waits for the device's previous holder (a stopping reader, a probe) to let go of it.
+DEVICE_WAIT_SECONDS = 2.0
+# Preview JPEG quality: well below cv2's default of 95, which costs ~2x the encode time for no visible gain.
+JPEG_QUALITY = 80
+# Keep probing snappy: fewer frames for FPS estimate and a short list of common modes (largest first).
 MAX_FPS_MEASURE_FRAMES = 8
+# Upper bound on waiting for a requested frame size to show up in the capture properties.
+MODE_SETTLE_SECONDS = 0.02
+# Requested to learn a camera's largest frame size: most UVC drivers clamp it to their maximum.
+OVERSIZED_FRAME = 99999
 COMMON_MODES = [
     (1920, 1080),
     (1600, 1200),
@@ -18,26 +42,87 @@ COMMON_MODES = [
 ]
 
 
-def _import_cv2():
-    try:
-        import cv2  # type: ignore
+def _aspect(width: int, height: int) -> Tuple[int, int]:
+    """Reduced aspect ratio, e.g. (16, 9) for 1920x1080."""
+    divisor = math.gcd(width, height) or 1
+    return width // divisor, height // divisor
+
 
-        return cv2
+_optional_modules: Dict[str, object] = {}
+
+
+def _optional_import(name: str):
+    """Import an optional dependency once; later calls return the cached module (or None when missing)."""
+    try:
+        return _optional_modules[name]
+    except KeyError:
+        pass
+    try:
+        module = importlib.import_module(name)
     except Exception:
+        module = None
+    _optional_modules[name] = module
+    return module
+
+
+def _import_cv2():
+    return _optional_import("cv2")
+
+
+def _import_realsense():
+    return _optional_import("pyrealsense2")
+
+
+def _import_numpy():
+    return _optional_import("numpy")
+
+
+def _import_enumerate_cameras():
+    return _optional_import("cv2_enumerate_cameras")
+
+
+_turbojpeg = None  # TurboJPEG instance, or False once the import failed
+
+
+def _get_turbojpeg():
+    global _turbojpeg
+    if _turbojpeg is None:
+        try:
+            from turbojpeg import TurboJPEG  # type: ignore
+
+            _turbojpeg = TurboJPEG()
+        except Exception:
+            _turbojpeg = False
+    return _turbojpeg or None
+
+
+def _encode_jpeg(cv2, img, quality: int = JPEG_QUALITY) -> Optional[bytes]:
+    """Encode a BGR frame as JPEG, using libjpeg-turbo (PyTurboJPEG) when installed and cv2 otherwise."""
+    jpeg = _get_turbojpeg()
+    if jpeg is not None:
+        try:
+            return jpeg.encode(img, quality=quality)  # defaults to TJPF_BGR input
+        except Exception:
+            pass
+    ok, buffer = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, quality, cv2.IMWRITE_JPEG_OPTIMIZE, 0])
+    if not ok:
         return None
+    return buffer.tobytes()
 
 
-@dataclass
+# slots: many instances per probe and hot attribute reads; the backend already requires Python >= 3.10.
+@dataclass(slots=True)
 class CameraMode:
     width: int
     height: int
     fps: float
 
     def to_dict(self) -> dict:
+        # Rounded here rather than once at construction, so a later fps assignment is never served stale.
         return {"width": int(self.width), "height": int(self.height), "fps": float(round(self.fps, 2))}
 
 
-@dataclass
+@dataclass(slots=True)
 class CameraDevice:
     id: str
     label: str
@@ -50,15 +135,167 @@ class CameraDevice:
     product_id: Optional[str] = None
     suggested: Optional[CameraMode] = None
 
+    def __post_init__(self) -> None:
+        # kind/backend are compared against literals on every lookup; interned strings compare by identity first.
+        self.kind = sys.intern(self.kind)
+        if self.backend is not None:
+            self.backend = sys.intern(self.backend)
+
     def to_dict(self) -> dict:
-        data = asdict(self)
-        if self.suggested:
-            data["suggested"] = self.suggested.to_dict()
-        return data
+        # Built by hand: asdict() rediscovers fields and deep-copies on every snapshot.
+        return {
+            "id": self.id,
+            "label": self.label,
+            "kind": self.kind,
+            "backend": self.backend,
+            "index": self.index,
+            "path": self.path,
+            "serial_number": self.serial_number,
+            "vendor_id": self.vendor_id,
+            "product_id": self.product_id,
+            "suggested": self.suggested.to_dict() if self.suggested else None,
+        }
+
+
+class _FrameWorker:
+    """
+    Reads one OpenCV capture continuously on a daemon thread into a single preallocated frame slot,
+    so snapshot requests copy the latest frame instead of driving the camera themselves.
+
+    The capture is opened by setup() on the reader thread while holding the device lock, and released
+    there too; the lock stays held while the capture is open, so request threads never wait for a previous
+    reader to let go of the device (on DirectShow opens are exclusive) and only ever signal it to stop.
+    """
+
+    def __init__(self, setup: Callable[[], object], device_lock: threading.Lock, np, raw: bool = False) -> None:
+        self.cap = None
+        # raw: the capture hands back undecoded MJPEG buffers (CAP_PROP_CONVERT_RGB off)
+        self.raw = raw
+        self._setup = setup
+        self._device_lock = device_lock
+        self._np = np
+        self._slot = None
+        self._has_frame = False
+        self._running = True
+        # _done: the reader finished; _handoff: detach() wants the capture kept open when it does
+        self._done = False
+        self._handoff = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    @property
+    def alive(self) -> bool:
+        return self._running and self._thread.is_alive()
+
+    def _loop(self) -> None:
+        cap = None
+        if not self._device_lock.acquire(timeout=DEVICE_WAIT_SECONDS):
+            with self._cond:
+                self._running = False
+                self._done = True
+                self._cond.notify_all()
+            return
+        try:
+            if not self._running:
+                return
+            cap = self._setup()
+            if cap is None:
+                return
+            with self._cond:
+                self.cap = cap
+            # Warmup a couple of frames to avoid black images; grab() skips decoding frames we drop
+            for _ in range(WARMUP_FRAMES):
+                if not self._running:
+                    return
+                cap.grab()
+            while self._running:
+                ok, frame = cap.read()
+                if not ok or frame is None:
+                    break
+                with self._cond:
+                    if self._slot is None or self._slot.shape != frame.shape or self._slot.dtype != frame.dtype:
+                        self._slot = frame.copy()
+                    else:
+                        self._np.copyto(self._slot, frame)
+                    self._has_frame = True
+                    self._cond.notify_all()
+        except Exception:
+            pass
+        finally:
+            with self._cond:
+                self._running = False
+                self._done = True
+                keep = self._handoff
+                self._cond.notify_all()
+            if cap is not None and not keep:
+                try:
+                    cap.release()
+                except Exception:
+                    pass
+            self._device_lock.release()
+
+    def latest(self, timeout: float):
+        """Copy of the newest frame, waiting up to timeout for the first one; None once the reader stopped."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._has_frame or not self._running, timeout)
+            if not self._running or not self._has_frame:
+                return None
+            return self._slot.copy()
+
+    def detach(self):
+        """
+        Stop the reader and hand back its still-open capture, or None if it had none or doesn't stop
+        within DEVICE_WAIT_SECONDS (it then releases the capture itself). Only the mode probe uses this;
+        it waits for at most one in-flight read.
+        """
+        with self._cond:
+            self._handoff = True
+            self._running = False
+            self._cond.wait_for(lambda: self._done, DEVICE_WAIT_SECONDS)
+            if self._done:
+                return self.cap
+            self._handoff = False
+            return None
+
+    def release(self) -> None:
+        """Signal the reader to stop; it releases the capture and the device lock itself."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+
+class _RealSenseStream:
+    """A started rs.pipeline, wrapped so it can sit in the capture pool next to cv2 captures."""
+
+    def __init__(self, pipeline) -> None:
+        self.pipeline = pipeline
+
+    def release(self) -> None:
+        try:
+            self.pipeline.stop()
+        except Exception:
+            pass
+
+
+class _SlugTable(dict):
+    """str.translate table: allowed slug characters map to themselves, everything else to a NUL marker."""
+
+    def __missing__(self, codepoint: int) -> int:
+        return 0
+
+
+_SLUG_TABLE = _SlugTable(
+    (ord(c), ord(c)) for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._-"
+)
+_SLUG_MARKER_RUN = re.compile("\x00+")
 
 
 def _slugify(value: str) -> str:
-    cleaned = re.sub(r"[^A-Za-z0-9._-]+", "-", value.strip())
+    # Same output as re.sub(r"[^A-Za-z0-9._-]+", "-", ...): ids are persisted, so runs still collapse to one dash.
+    cleaned = value.strip().translate(_SLUG_TABLE)
+    if "\x00" in cleaned:
+        cleaned = _SLUG_MARKER_RUN.sub("-", cleaned)
     return cleaned or "cam"
 
 
@@ -72,7 +309,32 @@ class CameraMonitor:
         self.interval = interval
         self.max_indices = max_indices
         self._devices: Dict[str, CameraDevice] = {}
+        self._device_tuple: Tuple[CameraDevice, ...] = ()
         self._lock = threading.Lock()
+        # device_id -> (cv2 capture or _RealSenseStream, requested (width, height, fps), last used monotonic time)
+        self._cap_pool: Dict[str, Tuple[object, Tuple[Optional[int], Optional[int], Optional[float]], float]] = {}
+        self._cap_lock = threading.Lock()
+        # device_id -> lock held by whoever has the device open (a reader, a probe, a RealSense capture)
+        self._device_locks: Dict[str, threading.Lock] = {}
+        # Last enumeration signatures and the devices built from them, so unchanged ticks skip rebuilding.
+        self._opencv_signature: Optional[tuple] = None
+        self._opencv_cache: List[CameraDevice] = []
+        self._realsense_signature: Optional[tuple] = None
+        self._realsense_cache: List[CameraDevice] = []
+        # (vid, pid, path) -> default mode read from a one-off capture open
+        self._suggested_cache: Dict[Tuple[str, str, str], CameraMode] = {}
+        # device_id -> (target, backend) that last opened successfully in _open_capture
+        self._open_winners: Dict[str, Tuple[object, Optional[str]]] = {}
+        self._rs_ctx = None
+        self._rs_lock = threading.Lock()
+        self._rs_device_by_serial: Dict[str, object] = {}
+        self._rs_modes_cache: Dict[str, List[CameraMode]] = {}
+        # device_id -> probed modes of an enumerated webcam; dropped with _open_winners on replug
+        self._opencv_modes_cache: Dict[str, List[CameraMode]] = {}
+        # device ids whose capture didn't hand back raw MJPEG; raw_mjpeg requests fall back to encoding
+        self._raw_unsupported: Set[str] = set()
+        self._detect_pool = ThreadPoolExecutor(max_workers=max(2, max_indices), thread_name_prefix="camdetect")
+        self._backoff = PollBackoff(interval)
         self._stop = threading.Event()
         self._thread = threading.Thread(target=self._run, daemon=True)
 
@@ -82,14 +344,22 @@ class CameraMonitor:
 
     def stop(self) -> None:
         self._stop.set()
+        self._backoff.wake()
         if self._thread.is_alive():
             self._thread.join(timeout=1)
+        with self._cap_lock:
+            pooled = list(self._cap_pool.values())
+            self._cap_pool.clear()
+        for cap, _, _ in pooled:
+            cap.release()
+        self._detect_pool.shutdown(wait=False)
 
-    def snapshot(self) -> List[CameraDevice]:
-        with self._lock:
-            return list(self._devices.values())
+    def snapshot(self) -> Sequence[CameraDevice]:
+        self._backoff.note_demand()
+        return self._device_tuple
 
     def get(self, device_id: str) -> Optional[CameraDevice]:
+        self._backoff.note_demand()
         with self._lock:
             return self._devices.get(device_id)
 
@@ -102,25 +372,194 @@ class CameraMonitor:
         return device, *self._probe_opencv_modes(device)
 
     def capture_frame(
-        self, device_id: str, width: Optional[int] = None, height: Optional[int] = None, fps: Optional[float] = None
+        self,
+        device_id: str,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        fps: Optional[float] = None,
+        jpeg_quality: int = JPEG_QUALITY,
+        raw_mjpeg: bool = False,
     ) -> Optional[bytes]:
+        """
+        Latest frame as JPEG bytes. raw_mjpeg asks webcams for their own MJPEG frames, returned as-is
+        (no decode/re-encode, camera's quality); devices that can't provide them are encoded as usual.
+        """
         device = self.get(device_id)
         if not device:
             return None
         if device.kind == "realsense":
-            return self._capture_realsense_frame(device, width=width, height=height, fps=fps)
-        return self._capture_opencv_frame(device, width=width, height=height, fps=fps)
+            return self._capture_realsense_frame(device, width=width, height=height, fps=fps, jpeg_quality=jpeg_quality)
+        return self._capture_opencv_frame(
+            device, width=width, height=height, fps=fps, jpeg_quality=jpeg_quality, raw_mjpeg=raw_mjpeg
+        )
+
+    async def capture_frame_async(
+        self,
+        device_id: str,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        fps: Optional[float] = None,
+        jpeg_quality: int = JPEG_QUALITY,
+        raw_mjpeg: bool = False,
+    ) -> Optional[bytes]:
+        """capture_frame for async callers: the frame wait and encode run off the event loop."""
+        return await asyncio.to_thread(
+            self.capture_frame,
+            device_id,
+            width=width,
+            height=height,
+            fps=fps,
+            jpeg_quality=jpeg_quality,
+            raw_mjpeg=raw_mjpeg,
+        )
 
     def _run(self) -> None:
+        udev_monitor = open_udev_monitor("video4linux", "usb")
         while not self._stop.is_set():
-            devices = self._detect_devices()
-            with self._lock:
-                self._devices = devices
-            time.sleep(self.interval)
+            changed = self._apply_devices(self._detect_devices())
+            self._release_idle_captures()
+            if udev_monitor is not None:
+                wait_for_udev(
+                    udev_monitor, self.interval, IDLE_RESCAN_TICKS, self._stop, on_tick=self._release_idle_captures
+                )
+            else:
+                self._backoff.wait(changed)
+
+    def _apply_devices(self, devices: Dict[str, CameraDevice]) -> bool:
+        """
+        Merge a detection pass into the live map in place, so CameraDevice references held by callers
+        (and the capture pool) stay valid across ticks for devices that are still present.
+        Returns whether anything was added, removed or updated.
+        """
+        changed = False
+        with self._lock:
+            current = self._devices
+            for device_id in current.keys() - devices.keys():
+                del current[device_id]
+                changed = True
+            for device_id, device in devices.items():
+                existing = current.get(device_id)
+                if existing is None:
+                    current[device_id] = device
+                    changed = True
+                elif existing is not device and existing != device:
+                    for f in fields(CameraDevice):
+                        setattr(existing, f.name, getattr(device, f.name))
+                    changed = True
+            if changed:
+                # Readers take this without the lock; the whole tuple is swapped, never mutated.
+                self._device_tuple = tuple(current.values())
+        return changed
+
+    def _release_idle_captures(self) -> None:
+        now = time.monotonic()
+        with self._cap_lock:
+            idle = [key for key, (_, _, last_used) in self._cap_pool.items() if now - last_used > CAPTURE_IDLE_SECONDS]
+            released = [self._cap_pool.pop(key)[0] for key in idle]
+        for cap in released:
+            cap.release()
+
+    def _device_lock(self, device_id: str) -> threading.Lock:
+        with self._cap_lock:
+            return self._device_locks.setdefault(device_id, threading.Lock())
+
+    def _take_capture(self, device_id: str):
+        """Remove and return the pooled capture for device_id regardless of its mode (reader stopped), or None."""
+        with self._cap_lock:
+            entry = self._cap_pool.pop(device_id, None)
+        if not entry:
+            return None
+        pooled = entry[0]
+        return pooled.detach() if isinstance(pooled, _FrameWorker) else pooled
+
+    def _checkout_capture(self, device: CameraDevice, mode: Tuple[Optional[int], Optional[int], Optional[float]]):
+        """
+        Take the pooled capture for device out of the pool if it was opened with the same mode.
+        Returns None when the caller must open a new one.
+        """
+        with self._cap_lock:
+            entry = self._cap_pool.pop(device.id, None)
+        if not entry:
+            return None
+        cap, pooled_mode, _ = entry
+        if pooled_mode != mode:
+            cap.release()
+            return None
+        return cap
+
+    def _frame_worker(
+        self, device: CameraDevice, mode: Tuple[Optional[int], Optional[int], Optional[float]], raw: bool = False
+    ):
+        """
+        Shared reader for device in mode, starting one (and retiring a stale or differently-configured one).
+        A live reader in the same mode is reused whether or not it is raw; the caller converts.
+        """
+        with self._cap_lock:
+            entry = self._cap_pool.get(device.id)
+            if entry is not None:
+                worker, pooled_mode, _ = entry
+                if pooled_mode == mode and isinstance(worker, _FrameWorker) and worker.alive:
+                    self._cap_pool[device.id] = (worker, mode, time.monotonic())
+                    return worker
+                # Only signalled here: the new reader's open waits for the device lock the old one holds.
+                worker.release()
+            # Installed before it opens anything, so a concurrent first request finds and shares it.
+            fresh = _FrameWorker(
+                lambda: self._open_configured(device, mode, raw),
+                self._device_locks.setdefault(device.id, threading.Lock()),
+                _import_numpy(),
+                raw=raw,
+            )
+            self._cap_pool[device.id] = (fresh, mode, time.monotonic())
+            return fresh
+
+    def _open_configured(
+        self, device: CameraDevice, mode: Tuple[Optional[int], Optional[int], Optional[float]], raw: bool
+    ):
+        """Open device and apply mode; runs on the reader thread."""
+        cv2 = _import_cv2()
+        cap = self._open_capture(device)
+        if not cap:
+            return None
+        width, height, fps = mode
+        try:
+            if width and height:
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            if fps and fps > 0:
+                cap.set(cv2.CAP_PROP_FPS, fps)
+
+            # CRITICAL: request MJPEG AFTER size/fps (works for your cams)
+            self._force_mjpeg_last(cv2, cap)
+            if raw:
+                cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+        except Exception:
+            cap.release()
+            return None
+        return cap
+
+    def _drop_worker(self, device_id: str, worker: _FrameWorker) -> None:
+        with self._cap_lock:
+            entry = self._cap_pool.get(device_id)
+            if entry is not None and entry[0] is worker:
+                del self._cap_pool[device_id]
+        worker.release()
+
+    def _checkin_capture(
+        self, device: CameraDevice, cap, mode: Tuple[Optional[int], Optional[int], Optional[float]]
+    ) -> None:
+        with self._cap_lock:
+            existing = self._cap_pool.get(device.id)
+            if existing is None:
+                self._cap_pool[device.id] = (cap, mode, time.monotonic())
+                return
+        # A concurrent request already returned a capture for this device; keep that one.
+        cap.release()
 
     def _detect_devices(self) -> Dict[str, CameraDevice]:
         devices: Dict[str, CameraDevice] = {}
-        seen_paths: Set[str] = set()
+        # Webcam enumeration is independent of RealSense discovery; only the filtering needs both.
+        cams_future = self._detect_pool.submit(self._enumerate_opencv)
         realsense_devices = self._detect_realsense()
         for cam in realsense_devices:
             devices[cam.id] = cam
@@ -132,24 +571,49 @@ class CameraMonitor:
                 realsense_signatures.add((sig[0].lower(), sig[1].lower()))
             if cam.serial_number:
                 realsense_serials.add(cam.serial_number)
-        for cam in self._detect_opencv(realsense_signatures, realsense_serials):
+        for cam in self._detect_opencv(realsense_signatures, realsense_serials, cams=cams_future.result()):
             devices[cam.id] = cam
         return devices
 
-    def _detect_realsense(self) -> List[CameraDevice]:
+    def _enumerate_opencv(self) -> list:
+        cv2 = _import_cv2()
+        if cv2 is None:
+            return []
         try:
-            import pyrealsense2 as rs  # type: ignore
+            return list(_import_enumerate_cameras().enumerate_cameras(getattr(cv2, "CAP_DSHOW", cv2.CAP_MSMF)))
         except Exception:
             return []
 
+    def _realsense_context(self, rs):
+        """One rs.context per monitor; constructing it starts librealsense's USB enumeration each time."""
+        with self._rs_lock:
+            if self._rs_ctx is None:
+                self._rs_ctx = rs.context()
+            return self._rs_ctx
+
+    def _detect_realsense(self) -> List[CameraDevice]:
+        rs = _import_realsense()
+        if rs is None:
+            return []
+
         found: List[CameraDevice] = []
         try:
-            ctx = rs.context()
-            for dev in ctx.query_devices():
+            ctx = self._realsense_context(rs)
+            rs_devices = list(ctx.query_devices())
+            serials: List[Optional[str]] = []
+            for dev in rs_devices:
                 try:
-                    serial = dev.get_info(rs.camera_info.serial_number)
+                    serials.append(dev.get_info(rs.camera_info.serial_number))
                 except Exception:
-                    serial = None
+                    serials.append(None)
+            self._rs_device_by_serial = {serial: dev for serial, dev in zip(serials, rs_devices) if serial}
+            signature = tuple(serials)
+            if signature == self._realsense_signature:
+                return list(self._realsense_cache)
+            for gone in self._rs_modes_cache.keys() - set(serials):
+                del self._rs_modes_cache[gone]
+
+            for dev, serial in zip(rs_devices, serials):
                 try:
                     name = dev.get_info(rs.camera_info.name)
                 except Exception:
@@ -198,6 +662,8 @@ class CameraMonitor:
                         suggested=suggested,
                     )
                 )
+            self._realsense_signature = signature
+            self._realsense_cache = list(found)
         except Exception:
             return []
         return found
@@ -206,6 +672,7 @@ class CameraMonitor:
         self,
         exclude_signatures: Optional[Set[Tuple[str, str]]] = None,
         exclude_serials: Optional[Set[str]] = None,
+        cams: Optional[list] = None,
     ) -> List[CameraDevice]:
         cv2 = _import_cv2()
         if cv2 is None:
@@ -213,12 +680,24 @@ class CameraMonitor:
 
         devices: Dict[str, CameraDevice] = {}
         seen_paths: Set[str] = set()
+        # base id -> next suffix for colliding slugs; per pass, so the same cameras get the same ids every tick
+        suffixes: Dict[str, int] = {}
 
         # Best effort hardware enumeration
-        try:
-            from cv2_enumerate_cameras import enumerate_cameras  # type: ignore
+        if cams is None:
+            cams = self._enumerate_opencv()
+
+        # Steady state: same cameras in the same order as last tick -> reuse the devices built then.
+        signature = (
+            tuple((str(c.vid or ""), str(c.pid or ""), c.path or "", c.index, c.name or "") for c in cams),
+            frozenset(exclude_signatures or ()),
+            frozenset(exclude_serials or ()),
+        )
+        if cams and signature == self._opencv_signature:
+            return list(self._opencv_cache)
 
-            for cam in enumerate_cameras(getattr(cv2, "CAP_DSHOW", cv2.CAP_MSMF)):
+        try:
+            for cam in cams:
                 name_lower = (cam.name or "").lower()
                 if "realsense" in name_lower:
                     continue
@@ -236,9 +715,11 @@ class CameraMonitor:
 
                 raw_id = capture_path or str(cam.index)
                 device_id = f"opencv:{_slugify(str(raw_id))}"
-                suggested = self._suggest_from_default_props(cv2, cam.index)
+                suggested = self._cached_default_suggestion(cv2, cam)
+                base_id = device_id
                 while device_id in devices:
-                    device_id = f"{device_id}-{len(devices)}"
+                    suffixes[base_id] = suffixes.get(base_id, 0) + 1
+                    device_id = f"{base_id}-{suffixes[base_id]}"
                 devices[device_id] = CameraDevice(
                     id=device_id,
                     label=cam.name or f"Camera {cam.index}",
@@ -256,17 +737,20 @@ class CameraMonitor:
             pass
 
         if devices:
-            return list(devices.values())
-
-        # Fallback: try opening a handful of indices
-        for idx in range(self.max_indices):
-            cap = cv2.VideoCapture(idx, getattr(cv2, "CAP_DSHOW", cv2.CAP_MSMF))
-
-            if not cap.isOpened():
-                cap.release()
+            # Cameras were (re)plugged: indices may have shifted, so forget remembered open targets.
+            self._open_winners.clear()
+            self._opencv_modes_cache.clear()
+            self._raw_unsupported.clear()
+            self._opencv_signature = signature
+            self._opencv_cache = list(devices.values())
+            return list(self._opencv_cache)
+
+        # Fallback: try opening a handful of indices (concurrently; each failed open can take hundreds of ms)
+        for idx, suggested in zip(
+            range(self.max_indices), self._detect_pool.map(lambda i: self._probe_index(cv2, i), range(self.max_indices))
+        ):
+            if suggested is False:
                 continue
-            suggested = self._suggest_from_props(cap)
-            cap.release()
             device_id = f"opencv:{_slugify(str(idx))}"
             devices[device_id] = CameraDevice(
                 id=device_id,
@@ -279,6 +763,27 @@ class CameraMonitor:
             )
         return list(devices.values())
 
+    def _probe_index(self, cv2, idx: int):
+        """Default mode of the camera at idx, None if it opens without usable props, False if it does not open."""
+        cap = cv2.VideoCapture(idx, getattr(cv2, "CAP_DSHOW", cv2.CAP_MSMF))
+        if not cap.isOpened():
+            cap.release()
+            return False
+        suggested = self._suggest_from_props(cap)
+        cap.release()
+        return suggested
+
+    def _cached_default_suggestion(self, cv2, cam) -> Optional[CameraMode]:
+        """Webcam default modes don't change, so open each physical camera for its defaults only once."""
+        key = (str(cam.vid or ""), str(cam.pid or ""), cam.path or str(cam.index))
+        suggested = self._suggested_cache.get(key)
+        if suggested is None:
+            suggested = self._suggest_from_default_props(cv2, cam.index)
+            # A busy or failed open gives None; leave it uncached so the next detection pass tries again.
+            if suggested is not None:
+                self._suggested_cache[key] = suggested
+        return suggested
+
     def _suggest_from_default_props(self, cv2, index: int) -> Optional[CameraMode]:
         cap = cv2.VideoCapture(index, cv2.CAP_MSMF)
         if not cap.isOpened():
@@ -302,64 +807,147 @@ class CameraMonitor:
             return None
 
     def _probe_opencv_modes(self, device: CameraDevice) -> tuple[List[CameraMode], Optional[CameraMode]]:
+        # Index-probed fallback devices have no identity beyond the index, so only enumerated ones are cached.
+        cacheable = device.path != str(device.index)
+        cached = self._opencv_modes_cache.get(device.id) if cacheable else None
+        if cached:
+            return list(cached), cached[0]
+        modes, suggested = self._probe_opencv_modes_uncached(device)
+        if cacheable and modes:
+            self._opencv_modes_cache[device.id] = list(modes)
+        return modes, suggested
+
+    def _probe_opencv_modes_uncached(self, device: CameraDevice) -> tuple[List[CameraMode], Optional[CameraMode]]:
+        node = device_node(device.path, device.index)
+        reported = enumerate_modes(node, COMMON_MODES) if node else None
+        if not reported:
+            position = dshow_modes.device_position(device.index, getattr(_import_cv2(), "CAP_DSHOW", None))
+            reported = dshow_modes.enumerate_modes(position) if position is not None else None
+        if reported:
+            modes = [CameraMode(width=w, height=h, fps=fps if fps > 0 else 30.0) for w, h, fps in reported]
+            modes.sort(key=lambda m: (m.width * m.height, m.fps), reverse=True)
+            return modes, modes[0]
+
         cv2 = _import_cv2()
         if cv2 is None:
             return [], None
 
-        cap = self._open_capture(device)
-        if not cap:
+        # Reuse the pooled preview capture when there is one: reopening costs far more than the probe, and
+        # DirectShow opens are exclusive anyway. Probing changes its mode, so it is released afterwards.
+        cap = self._take_capture(device.id)
+        device_lock = self._device_lock(device.id)
+        if not device_lock.acquire(timeout=DEVICE_WAIT_SECONDS):
+            if cap:
+                cap.release()
             return [], None
+        try:
+            cap = cap or self._open_capture(device)
+            if not cap:
+                return [], None
+            try:
+                best = self._probe_ladder(cv2, cap)
+            finally:
+                cap.release()
+        finally:
+            device_lock.release()
 
-        accepted: List[CameraMode] = []
-        seen = set()
+        accepted = list(best.values())
+        if not accepted and device.suggested:
+            accepted.append(device.suggested)
+
+        accepted.sort(key=lambda m: (m.width * m.height, m.fps), reverse=True)
+        suggested = accepted[0] if accepted else None
+        return accepted, suggested
+
+    def _probe_ladder(self, cv2, cap) -> Dict[Tuple[int, int], CameraMode]:
+        """Try each COMMON_MODES size on cap; (w, h) -> fastest mode the camera accepted at that size."""
+        limit = self._max_frame_size(cv2, cap)
+        # aspect ratio -> largest size the driver clamped a request of that shape to. Bounds only apply
+        # within a ratio: a driver that clamps 16:9 requests to 1920x1080 may still offer 1600x1200.
+        ceilings: Dict[Tuple[int, int], Tuple[int, int]] = {_aspect(*limit): limit} if limit else {}
+        # (w, h) -> fastest mode seen at that size
+        best: Dict[Tuple[int, int], CameraMode] = {}
         for w, h in COMMON_MODES:
+            if (w, h) in best:
+                continue
+            shape = _aspect(w, h)
+            ceiling = ceilings.get(shape)
+            if ceiling and (w > ceiling[0] or h > ceiling[1]):
+                continue
             try:
                 cap.set(cv2.CAP_PROP_FRAME_WIDTH, w)
                 cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
                 self._force_mjpeg_last(cv2, cap)
-                time.sleep(0.02)
-                aw = int(round(cap.get(cv2.CAP_PROP_FRAME_WIDTH)))
-                ah = int(round(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
-                if (aw, ah) != (w, h):
+                got = self._read_back_size(cv2, cap, w, h)
+                if got != (w, h):
+                    if 0 < got[0] < w and 0 < got[1] < h and _aspect(*got) == shape:
+                        ceilings[shape] = got
                     continue
-                key = (aw, ah)
-                if key in seen:
-                    continue
-                seen.add(key)
                 fps = float(cap.get(cv2.CAP_PROP_FPS) or 0.0)
                 if fps <= 0.1:
                     fps = self._measure_fps(cap)
-                accepted.append(CameraMode(width=aw, height=ah, fps=fps))
+                best[(w, h)] = CameraMode(width=w, height=h, fps=fps)
             except Exception:
                 continue
+        return best
 
-        cap.release()
-
-        if not accepted and device.suggested:
-            accepted.append(device.suggested)
-
-        accepted.sort(key=lambda m: (m.width * m.height, m.fps), reverse=True)
-        suggested = accepted[0] if accepted else None
-        return accepted, suggested
-
-    def _probe_realsense_modes(self, device: CameraDevice) -> tuple[List[CameraMode], Optional[CameraMode]]:
+    def _max_frame_size(self, cv2, cap) -> Optional[Tuple[int, int]]:
+        """
+        Largest frame size the driver clamps an oversized request to, so the ladder can skip modes of
+        the same aspect ratio above it. None when the answer doesn't look like a clamp (the driver may have rejected the request).
+        """
         try:
-            import pyrealsense2 as rs  # type: ignore
+            before = (int(round(cap.get(cv2.CAP_PROP_FRAME_WIDTH))), int(round(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))))
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, OVERSIZED_FRAME)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, OVERSIZED_FRAME)
+            after = self._read_back_size(cv2, cap, OVERSIZED_FRAME, OVERSIZED_FRAME)
         except Exception:
+            return None
+        # A real maximum can't be below the size the camera was already running at.
+        if after == before or after[0] < before[0] or after[1] < before[1]:
+            return None
+        return after
+
+    def _read_back_size(self, cv2, cap, w: int, h: int) -> Tuple[int, int]:
+        """
+        Read back the applied frame size, polling briefly for drivers that commit asynchronously.
+        Synchronous backends (MSMF, V4L2) match on the first read, so no settle delay is paid.
+        """
+        deadline = time.perf_counter() + MODE_SETTLE_SECONDS
+        while True:
+            aw = int(round(cap.get(cv2.CAP_PROP_FRAME_WIDTH)))
+            ah = int(round(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+            if (aw, ah) == (w, h) or time.perf_counter() >= deadline:
+                return aw, ah
+            time.sleep(0.001)
+
+    def _probe_realsense_modes(self, device: CameraDevice) -> tuple[List[CameraMode], Optional[CameraMode]]:
+        rs = _import_realsense()
+        if rs is None:
             return [], None
 
-        modes: List[CameraMode] = []
+        # RealSense profiles are fixed per device, so each serial is only walked once.
+        cache_key = device.serial_number or device.path or device.id
+        cached = self._rs_modes_cache.get(cache_key)
+        if cached is not None:
+            return list(cached), cached[0]
+
+        # Depth/IR sensors and pixel formats repeat the same color (w, h, fps); collect each once as a
+        # plain tuple and only build CameraModes for the unique, sorted survivors.
+        triples: Set[Tuple[int, int, float]] = set()
         try:
-            ctx = rs.context()
-            target = None
-            for dev in ctx.query_devices():
-                try:
-                    serial = dev.get_info(rs.camera_info.serial_number)
-                except Exception:
-                    serial = None
-                if serial == device.serial_number or serial == device.path:
-                    target = dev
-                    break
+            target = self._rs_device_by_serial.get(device.serial_number or "") or self._rs_device_by_serial.get(
+                device.path or ""
+            )
+            if target is None:
+                for dev in self._realsense_context(rs).query_devices():
+                    try:
+                        serial = dev.get_info(rs.camera_info.serial_number)
+                    except Exception:
+                        serial = None
+                    if serial == device.serial_number or serial == device.path:
+                        target = dev
+                        break
             if not target:
                 return [], None
             for sensor in target.sensors:
@@ -368,109 +956,142 @@ class CameraMonitor:
                         vprof = profile.as_video_stream_profile()
                         if vprof.stream_type() != rs.stream.color:
                             continue
-                        modes.append(CameraMode(width=vprof.width(), height=vprof.height(), fps=float(profile.fps())))
+                        triples.add((vprof.width(), vprof.height(), float(profile.fps())))
                     except Exception:
                         continue
         except Exception:
             return [], None
 
-        modes.sort(key=lambda m: (m.width * m.height, m.fps), reverse=True)
+        modes = [
+            CameraMode(width=w, height=h, fps=fps)
+            for w, h, fps in sorted(triples, key=lambda t: (t[0] * t[1], t[2], t[0]), reverse=True)
+        ]
+        if modes:
+            self._rs_modes_cache[cache_key] = list(modes)
         suggested = modes[0] if modes else device.suggested
         return modes, suggested
 
     def _capture_opencv_frame(
-        self, device: CameraDevice, width: Optional[int] = None, height: Optional[int] = None, fps: Optional[float] = None
+        self,
+        device: CameraDevice,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        fps: Optional[float] = None,
+        jpeg_quality: int = JPEG_QUALITY,
+        raw_mjpeg: bool = False,
     ) -> Optional[bytes]:
         cv2 = _import_cv2()
         if cv2 is None:
             return None
 
-        cap = self._open_capture(device)
-        if not cap:
+        raw_mjpeg = raw_mjpeg and device.id not in self._raw_unsupported
+        worker = self._frame_worker(device, (width, height, fps), raw=raw_mjpeg)
+        if worker is None:
             return None
-
-        try:
-            if width and height:
-                cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
-                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
-            if fps and fps > 0:
-                cap.set(cv2.CAP_PROP_FPS, fps)
-
-            # CRITICAL: request MJPEG AFTER size/fps (works for your cams)
-            self._force_mjpeg_last(cv2, cap)
-
-            # Warmup a couple of frames to avoid black images
-            for _ in range(3):
-                cap.read()
-
-            ok, frame = cap.read()
-            if not ok or frame is None:
-                return None
-            ok, buffer = cv2.imencode(".jpg", frame)
-            if not ok:
+        frame = worker.latest(FRAME_WAIT_SECONDS)
+        if frame is None:
+            self._drop_worker(device.id, worker)
+            return None
+        if worker.raw:
+            if frame[:2].tobytes() != b"\xff\xd8":
+                # Backend ignored CONVERT_RGB or the camera isn't streaming MJPEG: decode/encode as usual.
+                self._raw_unsupported.add(device.id)
+                self._drop_worker(device.id, worker)
+                return self._capture_opencv_frame(
+                    device, width=width, height=height, fps=fps, jpeg_quality=jpeg_quality
+                )
+            if raw_mjpeg:
+                return frame.tobytes()
+            # A raw reader serves encoded requests too, so alternating callers don't rebuild it.
+            frame = cv2.imdecode(frame, cv2.IMREAD_COLOR)
+            if frame is None:
                 return None
-            return buffer.tobytes()
+        try:
+            return _encode_jpeg(cv2, frame, jpeg_quality)
         except Exception:
             return None
-        finally:
-            cap.release()
 
     def _capture_realsense_frame(
-        self, device: CameraDevice, width: Optional[int] = None, height: Optional[int] = None, fps: Optional[float] = None
+        self,
+        device: CameraDevice,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        fps: Optional[float] = None,
+        jpeg_quality: int = JPEG_QUALITY,
     ) -> Optional[bytes]:
-        try:
-            import pyrealsense2 as rs  # type: ignore
-            import cv2  # type: ignore
-        except Exception:
+        rs = _import_realsense()
+        cv2 = _import_cv2()
+        np = _import_numpy()
+        if rs is None or cv2 is None or np is None:
             return None
 
-        config = rs.config()
-        try:
-            serial = device.serial_number or device.path
-            if serial:
-                config.enable_device(serial)
-        except Exception:
-            pass
-
         w = width or (device.suggested.width if device.suggested else 640)
         h = height or (device.suggested.height if device.suggested else 480)
         target_fps = int(round(fps or (device.suggested.fps if device.suggested else 30)))
+        mode = (w, h, target_fps)
 
-        try:
-            config.enable_stream(rs.stream.color, w, h, rs.format.bgr8, target_fps)
-        except Exception:
+        # Held from checkout to checkin, so concurrent requests don't both start a pipeline on the device.
+        device_lock = self._device_lock(device.id)
+        if not device_lock.acquire(timeout=DEVICE_WAIT_SECONDS):
             return None
+        try:
+            return self._capture_realsense_in_mode(rs, cv2, np, device, mode, jpeg_quality)
+        finally:
+            device_lock.release()
+
+    def _capture_realsense_in_mode(
+        self, rs, cv2, np, device: CameraDevice, mode: Tuple[int, int, int], jpeg_quality: int
+    ) -> Optional[bytes]:
+        w, h, target_fps = mode
+        # A pooled pipeline is already streaming in this mode: no restart, no device buffer reallocation.
+        stream = self._checkout_capture(device, mode)
+        if stream is None:
+            config = rs.config()
+            try:
+                serial = device.serial_number or device.path
+                if serial:
+                    config.enable_device(serial)
+            except Exception:
+                pass
+
+            try:
+                config.enable_stream(rs.stream.color, w, h, rs.format.bgr8, target_fps)
+            except Exception:
+                return None
+
+            pipeline = rs.pipeline()
+            try:
+                pipeline.start(config)
+            except Exception:
+                return None
+            stream = _RealSenseStream(pipeline)
 
-        pipeline = rs.pipeline()
         try:
-            pipeline.start(config)
             for _ in range(6):
-                frames = pipeline.wait_for_frames(timeout_ms=1500)
+                frames = stream.pipeline.wait_for_frames(timeout_ms=1500)
                 color = frames.get_color_frame()
                 if color:
                     frame = color.get_data()
                     if frame is None:
                         continue
-                    import numpy as np  # type: ignore
-
-                    img = np.asanyarray(frame)
-                    ok, buffer = cv2.imencode(".jpg", img)
-                    if ok:
-                        return buffer.tobytes()
-            return None
+                    # Zero-copy view of the bgr8 buffer; only valid while `color` is alive, which it is
+                    # until the (synchronous) encode below returns.
+                    img = np.frombuffer(frame, dtype=np.uint8).reshape(color.get_height(), color.get_width(), 3)
+                    data = _encode_jpeg(cv2, img, jpeg_quality)
+                    if data:
+                        self._checkin_capture(device, stream, mode)
+                        return data
         except Exception:
-            return None
-        finally:
-            try:
-                pipeline.stop()
-            except Exception:
-                pass
+            pass
+        stream.release()
+        return None
 
     def _measure_fps(self, cap) -> float:
         start = time.perf_counter()
         frames = 0
         for _ in range(MAX_FPS_MEASURE_FRAMES):
-            ok, _ = cap.read()
+            # Only counting delivered frames, so skip decoding them.
+            ok = cap.grab()
             if not ok:
                 break
             frames += 1
@@ -506,12 +1127,18 @@ class CameraMonitor:
         if cv2 is None:
             return None
 
+        # Go straight to the (target, backend) that opened this device last time.
+        winner = self._open_winners.get(device.id)
+        if winner is not None:
+            cap = self._try_open(cv2, *winner)
+            if cap is not None:
+                return cap
+            self._open_winners.pop(device.id, None)
+
         attempts = []
         matched_index = None
         try:
-            from cv2_enumerate_cameras import enumerate_cameras  # type: ignore
-
-            for cam in enumerate_cameras(getattr(cv2, "CAP_DSHOW", cv2.CAP_MSMF)):
+            for cam in _import_enumerate_cameras().enumerate_cameras(getattr(cv2, "CAP_DSHOW", cv2.CAP_MSMF)):
                 try:
                     vid_pid_match = (
                         str(cam.vid or "").lower() == (device.vendor_id or "").lower()
@@ -563,9 +1190,16 @@ class CameraMonitor:
             if key in seen:
                 continue
             seen.add(key)
-            flag = self._backend_flag(cv2, backend)
-            cap = cv2.VideoCapture(target, flag) if flag is not None else cv2.VideoCapture(target)
-            if cap.isOpened():
+            cap = self._try_open(cv2, target, backend)
+            if cap is not None:
+                self._open_winners[device.id] = key
                 return cap
-            cap.release()
+        return None
+
+    def _try_open(self, cv2, target, backend: Optional[str]):
+        flag = self._backend_flag(cv2, backend)
+        cap = cv2.VideoCapture(target, flag) if flag is not None else cv2.VideoCapture(target)
+        if cap.isOpened():
+            return cap
+        cap.release()
         return None
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import os
 import shlex
 import shutil
@@ -10,7 +11,10 @@ from typing import Dict, Tuple
 
 from .models import Robot
 
+CALIBRATION_MODULE = "lerobot.scripts.lerobot_calibrate"
 
+
+@functools.lru_cache(maxsize=1)
 def _find_repo_root() -> Path | None:
     candidate = Path(__file__).resolve().parent.parent / "lerobot" / "src"
     if candidate.exists():
@@ -18,7 +22,8 @@ def _find_repo_root() -> Path | None:
     return None
 
 
-def _build_env() -> Dict[str, str]:
+@functools.lru_cache(maxsize=1)
+def _env_template() -> Dict[str, str]:
     env = os.environ.copy()
     repo_root = _find_repo_root()
     if repo_root:
@@ -29,6 +34,19 @@ def _build_env() -> Dict[str, str]:
     return env
 
 
+def _build_env() -> Dict[str, str]:
+    # Callers add their own keys, so hand out a copy of the cached template.
+    return dict(_env_template())
+
+
+def clear_command_caches() -> None:
+    """Forget the cached repo root, env and console scripts (after os.environ or the checkout changes)."""
+    _find_repo_root.cache_clear()
+    _env_template.cache_clear()
+    _resolve_console_script.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
 def _resolve_console_script(name: str) -> str | None:
     suffix = ".exe" if os.name == "nt" else ""
     candidate = Path(sys.executable).resolve().parent / f"{name}{suffix}"
@@ -37,19 +55,25 @@ def _resolve_console_script(name: str) -> str | None:
     return shutil.which(name)
 
 
-def build_calibration_cmd(robot: Robot) -> list[str]:
+def build_calibration_args(robot: Robot) -> list[str]:
     role_key = "teleop" if robot.role == "leader" else "robot"
     return [
-        sys.executable,
-        "-u",  # unbuffered stdout/stderr so UI sees logs immediately
-        "-m",
-        "lerobot.scripts.lerobot_calibrate",
         f"--{role_key}.type={robot.device_type()}",
         f"--{role_key}.port={robot.com_port}",
         f"--{role_key}.id={robot.name}",
     ]
 
 
+def build_calibration_cmd(robot: Robot) -> list[str]:
+    return [
+        sys.executable,
+        "-u",  # unbuffered stdout/stderr so UI sees logs immediately
+        "-m",
+        CALIBRATION_MODULE,
+        *build_calibration_args(robot),
+    ]
+
+
 def run_calibration(robot: Robot, *, dry_run: bool = False) -> Tuple[bool, str]:
     cmd = build_calibration_cmd(robot)
     readable = subprocess.list2cmdline(cmd) if os.name == "nt" else " ".join(shlex.quote(p) for p in cmd)
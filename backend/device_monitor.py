@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import threading
-import time
-from typing import Dict, Tuple
+from typing import Callable, Dict, List, Mapping, Tuple
+
+from .hotplug import PollBackoff, open_udev_monitor, wait_for_udev
 
 POLL_SECONDS = 2.0
+IDLE_RESCAN_TICKS = 15
 
 
 class DeviceMonitor:
@@ -16,7 +18,8 @@ class DeviceMonitor:
     def __init__(self, interval: float = POLL_SECONDS):
         self.interval = interval
         self._ports: Dict[str, str] = {}
-        self._lock = threading.Lock()
+        self._backoff = PollBackoff(interval)
+        self._listeners: List[Callable[[], None]] = []
         self._stop = threading.Event()
         self._thread = threading.Thread(target=self._run, daemon=True)
 
@@ -26,12 +29,18 @@ class DeviceMonitor:
 
     def stop(self) -> None:
         self._stop.set()
+        self._backoff.wake()
         if self._thread.is_alive():
             self._thread.join(timeout=1)
 
-    def snapshot(self) -> Dict[str, str]:
-        with self._lock:
-            return dict(self._ports)
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """Call callback (from the monitor thread) whenever the set of ports changes."""
+        self._listeners.append(callback)
+
+    def snapshot(self) -> Mapping[str, str]:
+        """Current ports. _run swaps in a new dict instead of mutating, so this is shared; don't modify it."""
+        self._backoff.note_demand()
+        return self._ports
 
     def _detect_ports(self) -> Dict[str, str]:
         try:
@@ -48,8 +57,19 @@ class DeviceMonitor:
         return ports
 
     def _run(self) -> None:
+        # Serial adapters show up as tty add/remove events on Linux; elsewhere poll with backoff.
+        udev_monitor = open_udev_monitor("tty")
         while not self._stop.is_set():
             ports = self._detect_ports()
-            with self._lock:
+            changed = ports != self._ports
+            if changed:
                 self._ports = ports
-            time.sleep(self.interval)
+                for callback in self._listeners:
+                    try:
+                        callback()
+                    except Exception:
+                        pass
+            if udev_monitor is not None:
+                wait_for_udev(udev_monitor, self.interval, IDLE_RESCAN_TICKS, self._stop)
+            else:
+                self._backoff.wait(changed)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# DirectShow capability enumeration (Windows only, via the optional pygrabber package). The stream caps
+# the driver advertises replace the set-size / read-back ladder OpenCV needs, like v4l2_modes on Linux.
+
+
+def device_position(index: Optional[int], dshow_base: Optional[int]) -> Optional[int]:
+    """Position in DirectShow's video input list; cv2_enumerate_cameras offsets indices by the backend id."""
+    if index is None:
+        return None
+    return index - dshow_base if dshow_base and index >= dshow_base else index
+
+
+def _init_com() -> None:
+    import comtypes  # type: ignore
+
+    comtypes.CoInitialize()
+
+
+_com_lock = threading.Lock()
+_com_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _com_thread() -> ThreadPoolExecutor:
+    """
+    One thread that initializes COM once and runs every query; the process exits with COM still
+    initialized, so interfaces are never released after CoUninitialize.
+    """
+    global _com_pool
+    with _com_lock:
+        if _com_pool is None:
+            _com_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dshow", initializer=_init_com)
+        return _com_pool
+
+
+def enumerate_modes(position: int) -> Optional[List[Tuple[int, int, float]]]:
+    """
+    Return every (width, height, max fps) the DirectShow device at position advertises across its
+    media types, or None when not on Windows, pygrabber is missing or the device cannot be queried.
+    """
+    if not sys.platform.startswith("win") or position < 0:
+        return None
+    try:
+        import comtypes  # type: ignore  # noqa: F401
+        from pygrabber.dshow_graph import FilterGraph  # type: ignore  # noqa: F401
+    except Exception:
+        return None
+    try:
+        return _com_thread().submit(_query_modes, position).result()
+    except Exception:
+        # Includes a failed CoInitialize in the thread initializer (the pool then rejects further work).
+        return None
+
+
+def _query_modes(position: int) -> Optional[List[Tuple[int, int, float]]]:
+    from pygrabber.dshow_graph import FilterGraph  # type: ignore
+
+    modes: Dict[Tuple[int, int], float] = {}
+    graph = FilterGraph()
+    graph.add_video_input_device(position)
+    for fmt in graph.get_input_device().get_formats():
+        w, h = int(fmt.get("width") or 0), int(fmt.get("height") or 0)
+        fps = float(fmt.get("max_framerate") or 0.0)
+        if w <= 0 or h <= 0:
+            continue
+        if (w, h) not in modes or fps > modes[(w, h)]:
+            modes[(w, h)] = fps
+    if not modes:
+        return None
+    return [(w, h, fps) for (w, h), fps in modes.items()]
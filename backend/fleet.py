@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, Optional, Set
+
+from .jsonutil import dumps
+
+# Rebuild even without a change signal: calibration files are written by subprocesses and last_seen
+# of online robots should keep moving.
+FLEET_REFRESH_SECONDS = 5.0
+
+
+class FleetBroadcaster:
+    """
+    Builds the /ws/robots payload once per change and fans it out to every subscriber, instead of
+    each socket recomputing and diffing it on its own timer. notify() is safe to call from any thread.
+    """
+
+    def __init__(self, build: Callable[[], dict], refresh_seconds: float = FLEET_REFRESH_SECONDS):
+        self._build = build
+        self.refresh_seconds = refresh_seconds
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._last: Optional[str] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._dirty: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the producer on the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._dirty = asyncio.Event()
+        self._task = self._loop.create_task(self._produce())
+
+    def notify(self) -> None:
+        loop, dirty = self._loop, self._dirty
+        if loop is None or dirty is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(dirty.set)
+
+    def subscribe(self) -> asyncio.Queue:
+        # Holds at most the newest payload, so a slow client skips intermediate states.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        if self._last is not None:
+            queue.put_nowait(self._last)
+        self._subscribers.add(queue)
+        if self._dirty is not None:
+            self._dirty.set()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    async def _produce(self) -> None:
+        assert self._dirty is not None
+        while True:
+            try:
+                await asyncio.wait_for(self._dirty.wait(), self.refresh_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._dirty.clear()
+            if not self._subscribers:
+                self._last = None
+                continue
+            try:
+                # Built once for all subscribers; it stats calibration files, so keep it off the loop.
+                serialized = dumps(await asyncio.to_thread(self._build))
+            except Exception:
+                continue
+            if serialized == self._last:
+                continue
+            self._last = serialized
+            for queue in self._subscribers:
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(serialized)
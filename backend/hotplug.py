@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Optional
+
+# Caps both how late an unwatched replug shows up and how late idle captures are released (same tick).
+MAX_POLL_SECONDS = 5.0
+
+
+def open_udev_monitor(*subsystems: str):
+    """Return a started pyudev monitor filtered to subsystems, or None when udev is unavailable."""
+    try:
+        import pyudev  # type: ignore
+
+        context = pyudev.Context()
+        udev_monitor = pyudev.Monitor.from_netlink(context)
+        for subsystem in subsystems:
+            udev_monitor.filter_by(subsystem=subsystem)
+        udev_monitor.start()
+        return udev_monitor
+    except Exception:
+        return None
+
+
+def wait_for_udev(
+    udev_monitor,
+    interval: float,
+    max_ticks: int,
+    stop: threading.Event,
+    on_tick: Optional[Callable[[], None]] = None,
+) -> None:
+    """Block until a udev event (or max_ticks * interval), then drain the event burst."""
+    for _ in range(max_ticks):
+        if stop.is_set():
+            return
+        if on_tick is not None:
+            on_tick()
+        try:
+            event = udev_monitor.poll(timeout=interval)
+        except Exception:
+            stop.wait(interval)
+            return
+        if event is not None:
+            break
+    try:
+        while udev_monitor.poll(timeout=0) is not None:
+            pass
+    except Exception:
+        pass
+
+
+class PollBackoff:
+    """
+    Sleep schedule for monitors without hotplug events: the interval doubles (up to MAX_POLL_SECONDS)
+    while scans find nothing new and nobody reads the results, and drops back to the base interval
+    as soon as something changes or a caller asks for data.
+    """
+
+    def __init__(self, base: float, maximum: float = MAX_POLL_SECONDS):
+        self.base = base
+        self.maximum = max(base, maximum)
+        self.current = base
+        self._demand = False
+        self._wake = threading.Event()
+
+    def note_demand(self) -> None:
+        self._demand = True
+        if self.current > self.base:
+            # Backed off while idle; rescan now so the new reader doesn't see stale data for long.
+            self._wake.set()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def wait(self, changed: bool) -> None:
+        if changed or self._demand:
+            self.current = self.base
+        else:
+            self.current = min(self.current * 2, self.maximum)
+        self._demand = False
+        self._wake.wait(self.current)
+        self._wake.clear()
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import hashlib
+import json
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+
+def dumps(obj) -> str:
+    """Compact JSON text for websocket frames; orjson when installed, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str).decode()
+    return json.dumps(obj, separators=(",", ":"), default=str)
+
+
+def loads(data: bytes):
+    """Parse a whole file's bytes in one call; orjson when installed, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def dumps_indented(obj) -> bytes:
+    """Two-space indented UTF-8 JSON for files kept in git (robots.json), encoded in one pass."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, default=str).encode("utf-8")
+
+
+def payload_digest(text: str) -> bytes:
+    """16-byte fingerprint for "did this payload change" checks, so sockets don't each keep the last frame."""
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
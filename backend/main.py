@@ -2,19 +2,21 @@ from __future__ import annotations
 
 import asyncio
 import importlib.util
-import json
 import os
 import uuid
-from datetime import datetime
-from typing import List
+from datetime import datetime, timezone
+from typing import List, Mapping, Optional
 
-from fastapi import FastAPI, HTTPException, Response, WebSocket, WebSocketDisconnect
+from fastapi import Depends, FastAPI, HTTPException, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from .calibration_manager import CalibrationManager
 from .camera_monitor import CameraMonitor
 from .commands import _find_repo_root
 from .device_monitor import DeviceMonitor
+from .fleet import FleetBroadcaster
+from .jsonutil import dumps, orjson, payload_digest
 from .models import (
     Calibration,
     CalibrationSession,
@@ -27,14 +29,24 @@ from .models import (
     Robot,
     RobotCreate,
     RobotUpdate,
-    SUPPORTED_MODELS,
+    VALID_ROLES,
     RobotCamera,
     TeleopRequest,
 )
-from .storage import RobotStore
+from .storage import LAST_SEEN_FLUSH_SECONDS, RobotStore
 from .teleop_manager import TeleopManager
 
-app = FastAPI(title="LeRobot control backend")
+# Calibration sockets wake on session changes; this bounds how stale the robot's status can get.
+CALIBRATION_KEEPALIVE_SECONDS = 5.0
+
+# pydantic-core serializers, called directly on the websocket paths (model_dump's Python wrapper skipped)
+_ROBOT_SERIALIZER = Robot.__pydantic_serializer__
+_CAMERA_SERIALIZER = CameraDevice.__pydantic_serializer__
+
+app = FastAPI(
+    title="LeRobot control backend",
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -51,10 +63,42 @@ calibration_manager = CalibrationManager()
 teleop_manager = TeleopManager()
 
 
+def _fleet_payload() -> dict:
+    ports = monitor.snapshot()
+    return {
+        "type": "fleet_status",
+        "robots": [
+            _ROBOT_SERIALIZER.to_python(r, mode="json") for r in _list_with_status(ports, store.list_cached())
+        ],
+        "ports": ports,
+    }
+
+
+fleet = FleetBroadcaster(_fleet_payload)
+monitor.add_listener(fleet.notify)
+store.add_listener(fleet.notify)
+
+
 @app.on_event("startup")
 async def _startup() -> None:
     monitor.start()
     camera_monitor.start()
+    fleet.start()
+    asyncio.get_running_loop().create_task(_flush_store())
+
+
+@app.on_event("shutdown")
+async def _shutdown() -> None:
+    store.flush()
+
+
+async def _flush_store() -> None:
+    while True:
+        await asyncio.sleep(LAST_SEEN_FLUSH_SECONDS)
+        try:
+            await asyncio.to_thread(store.flush)
+        except Exception:
+            pass
 
 
 def _allow_real_commands() -> bool:
@@ -72,21 +116,44 @@ def _allow_real_commands() -> bool:
         return False
 
 
-def _with_status(robot: Robot) -> Robot:
-    ports = monitor.snapshot()
+def _with_status(
+    robot: Robot, ports: Optional[Mapping[str, str]] = None, now: Optional[datetime] = None
+) -> Robot:
+    if ports is None:
+        ports = monitor.snapshot()
     status = "online" if robot.com_port in ports else "offline"
     last_seen = robot.last_seen
     if status == "online":
-        last_seen = datetime.utcnow()
+        last_seen = now or datetime.now(timezone.utc)
         store.mark_seen(robot.id, last_seen)
-    return robot.model_copy(update={"status": status, "last_seen": last_seen})
+    # Every caller passes a Robot freshly built by the store, so fill it in instead of copying it.
+    robot.status = status
+    robot.last_seen = last_seen
+    return robot
+
+
+def _current_ports() -> Mapping[str, str]:
+    """Request dependency: one port snapshot shared by every status computed for the request."""
+    return monitor.snapshot()
+
+
+def _list_with_status(
+    ports: Optional[Mapping[str, str]] = None, robots: Optional[List[Robot]] = None
+) -> List[Robot]:
+    # One port snapshot and timestamp for the whole fleet instead of one per robot.
+    if ports is None:
+        ports = monitor.snapshot()
+    if robots is None:
+        robots = store.list()
+    now = datetime.now(timezone.utc)
+    return [_with_status(r, ports, now) for r in robots]
 
 
 def _validate_model_role(payload: RobotCreate) -> None:
-    model_info = SUPPORTED_MODELS.get(payload.model)
-    if not model_info:
+    roles = VALID_ROLES.get(payload.model)
+    if not roles:
         raise HTTPException(status_code=400, detail=f"Unsupported model: {payload.model}")
-    if payload.role not in model_info.get("roles", []):
+    if payload.role not in roles:
         raise HTTPException(status_code=400, detail=f"Unsupported role: {payload.role}")
 
 
@@ -133,28 +200,28 @@ def probe_camera(device_id: str) -> CameraProbe:
 
 
 @app.get("/cameras/{device_id}/snapshot")
-def camera_snapshot(
+async def camera_snapshot(
     device_id: str,
     width: int | None = None,
     height: int | None = None,
     fps: float | None = None,
+    raw: bool = False,
 ) -> Response:
-    data = camera_monitor.capture_frame(device_id, width=width, height=height, fps=fps)
+    data = await camera_monitor.capture_frame_async(device_id, width=width, height=height, fps=fps, raw_mjpeg=raw)
     if not data:
         raise HTTPException(status_code=404, detail="Could not capture preview from this camera.")
     return Response(content=data, media_type="image/jpeg")
 
 
 @app.get("/robots", response_model=List[Robot])
-def list_robots() -> List[Robot]:
-    return [_with_status(r) for r in store.list()]
+def list_robots(ports: Mapping[str, str] = Depends(_current_ports)) -> List[Robot]:
+    return _list_with_status(ports)
 
 
 @app.post("/robots", response_model=Robot)
 def create_robot(payload: RobotCreate) -> Robot:
     _validate_model_role(payload)
-    existing_names = {r.name.lower() for r in store.list()}
-    if payload.name.lower() in existing_names:
+    if store.name_taken(payload.name):
         raise HTTPException(status_code=400, detail="A robot with that name already exists.")
     robot = store.add(payload)
     return _with_status(robot)
@@ -169,8 +236,7 @@ def update_robot(robot_id: str, payload: RobotUpdate) -> Robot:
         new_name = (updates["name"] or "").strip()
         if not new_name:
             raise HTTPException(status_code=400, detail="Name cannot be empty.")
-        existing = {r.name.lower() for r in store.list() if r.id != robot_id}
-        if new_name.lower() in existing:
+        if store.name_taken(new_name, exclude_id=robot_id):
             raise HTTPException(status_code=400, detail="A robot with that name already exists.")
         updates["name"] = new_name
 
@@ -350,9 +416,9 @@ def delete_calibration(robot_id: str) -> Robot:
 
 
 @app.post("/teleop/start")
-def start_teleop(payload: TeleopRequest) -> dict:
-    leader = _with_status(_require_robot(payload.leader_id))
-    follower = _with_status(_require_robot(payload.follower_id))
+def start_teleop(payload: TeleopRequest, ports: Mapping[str, str] = Depends(_current_ports)) -> dict:
+    leader = _with_status(_require_robot(payload.leader_id), ports)
+    follower = _with_status(_require_robot(payload.follower_id), ports)
 
     if leader.model != follower.model:
         raise HTTPException(status_code=400, detail="Leader and follower must be the same model.")
@@ -381,9 +447,9 @@ def start_teleop(payload: TeleopRequest) -> dict:
 
 
 @app.post("/teleop/stop")
-def stop_teleop(payload: TeleopRequest) -> dict:
-    leader = _with_status(_require_robot(payload.leader_id))
-    follower = _with_status(_require_robot(payload.follower_id))
+def stop_teleop(payload: TeleopRequest, ports: Mapping[str, str] = Depends(_current_ports)) -> dict:
+    leader = _with_status(_require_robot(payload.leader_id), ports)
+    follower = _with_status(_require_robot(payload.follower_id), ports)
     ok, message, state = teleop_manager.stop(leader.id, follower.id)
     if not ok:
         raise HTTPException(status_code=400, detail=message)
@@ -397,36 +463,30 @@ def stop_teleop(payload: TeleopRequest) -> dict:
 @app.websocket("/ws/robots")
 async def robots_stream(websocket: WebSocket) -> None:
     await websocket.accept()
-    last_payload: str | None = None
+    updates = fleet.subscribe()
     try:
         while True:
-            robots = [_with_status(r) for r in store.list()]
-            ports = monitor.snapshot()
-            payload = {
-                "type": "fleet_status",
-                "robots": [r.model_dump(mode="json") for r in robots],
-                "ports": ports,
-            }
-            serialized = json.dumps(payload, sort_keys=True)
-            if serialized != last_payload:
-                await websocket.send_json(payload)
-                last_payload = serialized
-            await asyncio.sleep(2)
+            await websocket.send_text(await updates.get())
     except WebSocketDisconnect:
         return
+    finally:
+        fleet.unsubscribe(updates)
 
 
 @app.websocket("/ws/cameras")
 async def cameras_stream(websocket: WebSocket) -> None:
     await websocket.accept()
-    last_payload: str | None = None
+    last_digest: bytes | None = None
     try:
         while True:
-            devices = [_serialize_camera_device(d).model_dump(mode="json") for d in camera_monitor.snapshot()]
-            serialized = json.dumps(devices, sort_keys=True)
-            if serialized != last_payload:
-                await websocket.send_json({"type": "camera_devices", "devices": devices})
-                last_payload = serialized
+            devices = [
+                _CAMERA_SERIALIZER.to_python(_serialize_camera_device(d), mode="json") for d in camera_monitor.snapshot()
+            ]
+            serialized = dumps({"type": "camera_devices", "devices": devices})
+            digest = payload_digest(serialized)
+            if digest != last_digest:
+                await websocket.send_text(serialized)
+                last_digest = digest
             await asyncio.sleep(1.0)
     except WebSocketDisconnect:
         return
@@ -435,14 +495,20 @@ async def cameras_stream(websocket: WebSocket) -> None:
 @app.websocket("/ws/calibration/{session_id}")
 async def calibration_stream(websocket: WebSocket, session_id: str) -> None:
     await websocket.accept()
+    state = calibration_manager.get(session_id)
+    if not state:
+        await websocket.send_json({"error": "not_found", "session_id": session_id})
+        await websocket.close(code=4404)
+        return
+
+    changed = state.watch()
+    last_digest: bytes | None = None
+    # Log lines the client already has; after the first full snapshot only new lines are sent.
+    sent_total: int | None = None
     try:
         while True:
-            state = calibration_manager.get(session_id)
-            if not state:
-                await websocket.send_json({"error": "not_found", "session_id": session_id})
-                await websocket.close(code=4404)
-                return
-
+            # Cleared before reading the state, so a change that lands mid-send wakes the next round.
+            changed.clear()
             try:
                 robot = _with_status(_require_robot(state.robot_id))
             except HTTPException:
@@ -450,25 +516,46 @@ async def calibration_stream(websocket: WebSocket, session_id: str) -> None:
                 await websocket.close(code=4404)
                 return
 
-            snapshot = state.snapshot()
+            new_logs = None
+            if sent_total is not None:
+                new_logs, logs_total = state.logs.since(sent_total)
             payload = {
-                "session_id": snapshot["session_id"],
-                "robot": robot.model_dump(mode="json"),
-                "logs": snapshot["logs"],
-                "running": snapshot["running"],
-                "dry_run": snapshot["dry_run"],
-                "return_code": snapshot["return_code"],
-                "ranges": snapshot["ranges"],
+                "type": "snapshot" if new_logs is None else "delta",
+                "session_id": state.id,
+                "robot": _ROBOT_SERIALIZER.to_python(robot, mode="json"),
+                "running": state.running,
+                "dry_run": state.dry_run,
+                "return_code": state.return_code,
+                "ranges": list(state.ranges.values()),
+                "logs_max": state.logs.capacity,
             }
-            await websocket.send_json(payload)
-            await asyncio.sleep(0.2)
+            if new_logs is None:
+                payload["logs"], logs_total = state.logs.read()
+            else:
+                payload["logs_from"] = sent_total
+                payload["logs"] = new_logs
+            payload["logs_total"] = logs_total
+            serialized = dumps(payload)
+            # Keep-alive rounds with nothing new resend nothing.
+            digest = payload_digest(serialized)
+            if digest != last_digest:
+                await websocket.send_text(serialized)
+                last_digest = digest
+                sent_total = logs_total
+            try:
+                await asyncio.wait_for(changed.wait(), CALIBRATION_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                pass
     except WebSocketDisconnect:
         return
+    finally:
+        state.unwatch(changed)
 
 
 @app.websocket("/ws/teleop/{session_id}")
 async def teleop_stream(websocket: WebSocket, session_id: str) -> None:
     await websocket.accept()
+    last_digest: bytes | None = None
     try:
         while True:
             state = teleop_manager.get(session_id)
@@ -477,7 +564,11 @@ async def teleop_stream(websocket: WebSocket, session_id: str) -> None:
                 await websocket.close(code=4404)
                 return
 
-            await websocket.send_json(state.snapshot())
+            serialized = dumps(state.snapshot())
+            digest = payload_digest(serialized)
+            if digest != last_digest:
+                await websocket.send_text(serialized)
+                last_digest = digest
             await asyncio.sleep(0.2)
     except WebSocketDisconnect:
         return
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import List, Optional, Literal
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, List, Optional, Literal, Tuple
 
 from pydantic import BaseModel, Field
 
 
+def _utc_now() -> datetime:
+    # Timezone-aware, like the last_seen stamps: naive and aware datetimes can't be compared.
+    return datetime.now(timezone.utc)
+
+
 SUPPORTED_MODELS = {
     "so101": {
         "roles": ["leader", "follower"],
@@ -16,6 +21,22 @@ SUPPORTED_MODELS = {
     }
 }
 
+# (model, role) -> lerobot device type, flattened once from SUPPORTED_MODELS
+DEVICE_TYPES: Dict[Tuple[str, str], str] = {
+    (model, role): device_type
+    for model, info in SUPPORTED_MODELS.items()
+    for role, device_type in info.get("device_types", {}).items()
+}
+
+# model -> roles it can be registered with
+VALID_ROLES: Dict[str, FrozenSet[str]] = {
+    model: frozenset(info.get("roles", [])) for model, info in SUPPORTED_MODELS.items()
+}
+
+
+def device_type_for(model: Optional[str], role: Optional[str]) -> str:
+    return DEVICE_TYPES.get((model, role)) or f"{model}_{role}"
+
 
 class JointCalibration(BaseModel):
     name: str
@@ -26,7 +47,7 @@ class JointCalibration(BaseModel):
 
 class Calibration(BaseModel):
     joints: List[JointCalibration]
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=_utc_now)
 
 
 class RobotBase(BaseModel):
@@ -36,9 +57,7 @@ class RobotBase(BaseModel):
     com_port: str = Field(..., description="Windows COM port such as COM13")
 
     def device_type(self) -> str:
-        model_info = SUPPORTED_MODELS.get(self.model, {})
-        mapping = model_info.get("device_types", {})
-        return mapping.get(self.role, f"{self.model}_{self.role}")
+        return device_type_for(self.model, self.role)
 
 
 class RobotCreate(RobotBase):
@@ -118,7 +137,7 @@ class RobotCamera(BaseModel):
     height: int
     fps: float
     index: Optional[int] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utc_now)
 
 
 class CameraCreate(BaseModel):
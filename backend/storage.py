@@ -1,17 +1,30 @@
 from __future__ import annotations
 
-import json
+import atexit
+import functools
+import logging
 import os
 from pathlib import Path
-import shutil
 import threading
+import time
 import uuid
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
 
-from .models import Robot, RobotCamera, RobotCreate, SUPPORTED_MODELS
+from .jsonutil import dumps_indented, loads
+from .models import Robot, RobotCamera, RobotCreate, device_type_for
 
+LAST_SEEN_FLUSH_SECONDS = 30.0
+SAVE_COALESCE_SECONDS = 0.2
+# Retry delays after a failed write (e.g. robots.json briefly locked by an antivirus scan or an editor).
+SAVE_RETRY_SECONDS = 0.5
+SAVE_RETRY_MAX_SECONDS = 30.0
+CALIB_RECHECK_SECONDS = 1.0
+# Coarsest directory mtime resolution to allow for (FAT/exFAT: 2 s; some network mounts are similar).
+MTIME_GRANULARITY_NS = 2_000_000_000
 DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "robots.json"
+logger = logging.getLogger(__name__)
+
 CALIB_ROOT = Path(
     os.getenv(
         "HF_LEROBOT_CALIBRATION",
@@ -20,28 +33,87 @@ CALIB_ROOT = Path(
 ).expanduser()
 
 
-def _device_type(data: Dict) -> str:
-    model_info = SUPPORTED_MODELS.get(data.get("model"), {})
-    mapping = model_info.get("device_types", {})
-    role = data.get("role", "")
-    return mapping.get(role, f"{data.get('model', 'unknown')}_{role}")
+def _calibration_location(data: Dict) -> Tuple[Path, str]:
+    """(directory, file name) of the record's calibration file; what the existence checks need."""
+    # Calibration files are keyed by the user-friendly id used in lerobot CLI (we map to the robot name).
+    return _calibration_location_for(
+        data.get("model", "unknown"), data.get("role", ""), data.get("name") or data.get("id")
+    )
 
 
 def _calibration_path(data: Dict) -> Path:
-    device_type = _device_type(data)
-    scope = "teleoperators" if data.get("role") == "leader" else "robots"
-    # Calibration files are keyed by the user-friendly id used in lerobot CLI (we map to the robot name).
-    name = data.get("name") or data.get("id")
-    return CALIB_ROOT / scope / device_type / f"{name}.json"
+    # Only for file operations (remove/rename); reads stick to _calibration_location.
+    directory, filename = _calibration_location(data)
+    return directory / filename
+
+
+@functools.lru_cache(maxsize=512)
+def _calibration_location_for(model: str, role: str, name: str) -> Tuple[Path, str]:
+    # Pure in its arguments (CALIB_ROOT is fixed at import), so renames just miss; nothing to invalidate.
+    scope = "teleoperators" if role == "leader" else "robots"
+    return CALIB_ROOT / scope / device_type_for(model, role), f"{name}.json"
+
+
+class _CalibrationIndex:
+    """
+    Which calibration files exist, per directory. A directory listing is reused until the directory's
+    mtime changes (a file was created, removed or renamed in it), and that mtime is re-read at most once
+    per CALIB_RECHECK_SECONDS, so listing N robots costs a stat per directory instead of one per robot.
+    A listing taken within MTIME_GRANULARITY_NS of the mtime isn't trusted: on coarse-timestamp filesystems
+    a file written in the same tick leaves the mtime unchanged.
+    """
+
+    def __init__(self) -> None:
+        # directory -> (checked at (monotonic), mtime_ns or None if missing, file names, listed at (wall ns))
+        self._dirs: Dict[Path, Tuple[float, Optional[int], FrozenSet[str], int]] = {}
+        self._lock = threading.Lock()
+
+    def exists(self, directory: Path, filename: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._dirs.get(directory)
+        if entry is None or now - entry[0] >= CALIB_RECHECK_SECONDS:
+            try:
+                mtime: Optional[int] = directory.stat().st_mtime_ns
+            except OSError:
+                mtime = None
+            # Listed long enough after the last change that nothing can have landed in the same mtime tick.
+            settled = mtime is None or (entry is not None and entry[3] - mtime >= MTIME_GRANULARITY_NS)
+            if entry is not None and entry[1] == mtime and settled:
+                names, listed_at = entry[2], entry[3]
+            elif mtime is None:
+                names, listed_at = frozenset(), time.time_ns()
+            else:
+                listed_at = time.time_ns()
+                try:
+                    with os.scandir(directory) as it:
+                        names = frozenset(e.name for e in it if e.is_file())
+                except OSError:
+                    names = frozenset()
+            entry = (now, mtime, names, listed_at)
+            with self._lock:
+                self._dirs[directory] = entry
+        return filename in entry[2]
+
+    def invalidate(self, *paths: Path) -> None:
+        with self._lock:
+            for path in paths:
+                self._dirs.pop(path.parent, None)
 
 
 def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
     if not value:
         return None
-    try:
-        return datetime.fromisoformat(value)
-    except Exception:
-        return None
+    if isinstance(value, datetime):
+        # Camera records added this session still hold the model's datetime until the next load.
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(value)
+        except Exception:
+            return None
+    # Stamps saved before the switch to aware datetimes were naive UTC (utcnow()).
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
 
 
 def _clean_camera_entry(item: Dict) -> Dict:
@@ -66,6 +138,50 @@ class RobotStore:
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self._lock = threading.Lock()
         self._data = self._load()
+        # id -> record (the same dicts as in self._data["robots"], which keeps the on-disk order)
+        self._index: Dict[str, Dict] = {}
+        # lower-cased name -> id, for duplicate-name checks
+        self._names: Dict[str, str] = {}
+        self._reindex()
+        self._calibrations = _CalibrationIndex()
+        # last_seen changed in memory since the last write (mark_seen doesn't write on its own)
+        self._seen_dirty = False
+        self._listeners: List[Callable[[], None]] = []
+        # (record, Robot) pairs built by list_cached(); dropped by _save() on every mutation.
+        self._materialized: Optional[List[Tuple[Dict, Robot]]] = None
+        # (id(record dict), key) -> (raw value, parsed datetime); see _record_datetime.
+        self._parsed_datetimes: Dict[Tuple[int, str], Tuple[object, Optional[datetime]]] = {}
+        # Mutations only mark the store dirty; one writer thread coalesces bursts into a single write.
+        self._dirty = threading.Event()
+        self._write_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+        # The writer is a daemon thread; don't lose coalesced changes or last_seen when the process exits
+        # without the app's shutdown hook (scripts, tests, a killed reloader child).
+        atexit.register(self._flush_at_exit)
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """Call callback after any change to the stored robots (not after mark_seen)."""
+        self._listeners.append(callback)
+
+    def _reindex(self) -> None:
+        robots = self._data.get("robots", [])
+        self._index = {item["id"]: item for item in robots if item.get("id")}
+        self._names = {
+            str(item["name"]).lower(): item["id"] for item in robots if item.get("id") and item.get("name")
+        }
+
+    def name_taken(self, name: str, exclude_id: Optional[str] = None) -> bool:
+        with self._lock:
+            owner = self._names.get(name.lower())
+        return owner is not None and owner != exclude_id
+
+    def _notify(self) -> None:
+        for callback in self._listeners:
+            try:
+                callback()
+            except Exception:
+                pass
 
     def _clean_record(self, item: Dict) -> Dict:
         return {
@@ -85,31 +201,96 @@ class RobotStore:
     def _load(self) -> Dict:
         if self.path.exists():
             try:
-                with self.path.open("r", encoding="utf-8") as fp:
-                    data = json.load(fp)
-                    cleaned = {"robots": []}
-                    for item in data.get("robots", []):
-                        cleaned["robots"].append(self._clean_record(item))
-                    return cleaned
+                data = loads(self.path.read_bytes())
+                cleaned = {"robots": []}
+                for item in data.get("robots", []):
+                    cleaned["robots"].append(self._clean_record(item))
+                return cleaned
             except Exception:
                 pass
         return {"robots": []}
 
     def _save(self) -> None:
-        serializable = {"robots": [self._clean_record(item) for item in self._data.get("robots", [])]}
-        with self.path.open("w", encoding="utf-8") as fp:
-            json.dump(serializable, fp, indent=2, default=str)
+        """Schedule a write of the current data (call with self._lock held)."""
+        self._materialized = None
+        # Drops entries of removed records and cameras; mutations are rare next to reads.
+        self._parsed_datetimes.clear()
+        self._seen_dirty = False
+        self._dirty.set()
+
+    def _writer_loop(self) -> None:
+        retry = SAVE_RETRY_SECONDS
+        while True:
+            self._dirty.wait()
+            time.sleep(SAVE_COALESCE_SECONDS)
+            try:
+                self._write()
+                retry = SAVE_RETRY_SECONDS
+            except Exception:
+                # _write() marked the store dirty again, so the change is retried rather than dropped.
+                logger.exception("Failed to write %s; retrying in %.1fs", self.path, retry)
+                time.sleep(retry)
+                retry = min(retry * 2, SAVE_RETRY_MAX_SECONDS)
+
+    def _write(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                self._dirty.clear()
+                self._seen_dirty = False
+                # _clean_record builds fresh dicts, so this is a snapshot safe to dump outside the lock.
+                serializable = {"robots": [self._clean_record(item) for item in self._data.get("robots", [])]}
+            try:
+                data = dumps_indented(serializable)
+                # Per-process name: two panel processes sharing data/ must not interleave into one temp file.
+                tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+                tmp.write_bytes(data)
+                os.replace(tmp, self.path)
+            except Exception:
+                # Nothing reached disk: keep the change pending for the next attempt.
+                self._dirty.set()
+                raise
 
     def list(self) -> List[Robot]:
         with self._lock:
-            return [self._to_robot(item) for item in self._data.get("robots", [])]
+            built = [
+                (self._to_robot(item, check_calibration=False), _calibration_location(item))
+                for item in self._data.get("robots", [])
+            ]
+        return self._fill_calibration(built)
+
+    def _fill_calibration(self, built: List[Tuple[Robot, Tuple[Path, str]]]) -> List[Robot]:
+        """
+        Set has_calibration outside self._lock: a stale directory listing means a stat/scandir, and
+        readers shouldn't queue behind filesystem calls (slow on network or FAT-mounted caches).
+        """
+        for robot, (directory, filename) in built:
+            robot.has_calibration = self._calibrations.exists(directory, filename)
+        return [robot for robot, _ in built]
+
+    def list_cached(self) -> List[Robot]:
+        """
+        Like list(), but returns the same Robot objects until the next mutation, refreshing only
+        last_seen and has_calibration (both change without one). Meant for the single fleet builder;
+        other callers should use list(), since callers fill in status on the returned objects.
+        """
+        with self._lock:
+            if self._materialized is None:
+                self._materialized = [
+                    (item, self._to_robot(item, check_calibration=False)) for item in self._data.get("robots", [])
+                ]
+            built = []
+            for item, robot in self._materialized:
+                robot.last_seen = self._record_datetime(item, "last_seen")
+                built.append((robot, _calibration_location(item)))
+        return self._fill_calibration(built)
 
     def get(self, robot_id: str) -> Optional[Robot]:
         with self._lock:
-            for item in self._data.get("robots", []):
-                if item.get("id") == robot_id:
-                    return self._to_robot(item)
-        return None
+            item = self._index.get(robot_id)
+            if not item:
+                return None
+            built = [(self._to_robot(item, check_calibration=False), _calibration_location(item))]
+        return self._fill_calibration(built)[0]
 
     def add(self, payload: RobotCreate) -> Robot:
         record = payload.model_dump()
@@ -117,74 +298,112 @@ class RobotStore:
         record["last_seen"] = None
         with self._lock:
             self._data.setdefault("robots", []).append(record)
+            self._index[record["id"]] = record
+            if record.get("name"):
+                self._names[str(record["name"]).lower()] = record["id"]
             self._save()
+        self._notify()
         return self._to_robot(record)
 
     def delete(self, robot_id: str) -> bool:
         removed: Dict | None = None
         deleted = False
         with self._lock:
-            robots = self._data.get("robots", [])
-            new_list = []
-            for item in robots:
-                if item.get("id") == robot_id:
-                    removed = item.copy()
-                    continue
-                new_list.append(item)
-            deleted = len(new_list) != len(robots)
-            if deleted:
-                self._data["robots"] = new_list
+            item = self._index.pop(robot_id, None)
+            if item is not None:
+                removed = item.copy()
+                self._data["robots"] = [r for r in self._data.get("robots", []) if r is not item]
+                if self._names.get(str(item.get("name") or "").lower()) == robot_id:
+                    del self._names[str(item["name"]).lower()]
+                deleted = True
                 self._save()
         if removed:
             self._remove_calibration_file(removed)
+        if deleted:
+            self._notify()
         return deleted
 
     def set_calibration(self, robot_id: str, calibration) -> Optional[Robot]:
+        robot: Optional[Robot] = None
         with self._lock:
-            for item in self._data.get("robots", []):
-                if item.get("id") == robot_id:
-                    # No calibration data persisted to robots.json
-                    self._save()
-                    return self._to_robot(item)
-        return None
+            item = self._index.get(robot_id)
+            if item is not None:
+                # No calibration data persisted to robots.json (_clean_record has no calibration state),
+                # so there is nothing to save. The file was just written by lerobot, so don't let a cached
+                # directory listing hide it for up to CALIB_RECHECK_SECONDS.
+                self._calibrations.invalidate(_calibration_path(item))
+                robot = self._to_robot(item)
+        if robot:
+            self._notify()
+        return robot
 
     def clear_calibration(self, robot_id: str) -> Optional[Robot]:
         target: Dict | None = None
         with self._lock:
-            for item in self._data.get("robots", []):
-                if item.get("id") == robot_id:
-                    target = item.copy()
-                    self._save()
-                    break
+            item = self._index.get(robot_id)
+            if item is not None:
+                # Only the calibration file changes; robots.json stays as it is.
+                target = item.copy()
         if target:
             self._remove_calibration_file(target)
+            self._notify()
             return self._to_robot(target)
         return None
 
     def mark_seen(self, robot_id: str, at: datetime) -> None:
         with self._lock:
-            for item in self._data.get("robots", []):
-                if item.get("id") == robot_id:
-                    item["last_seen"] = at.isoformat()
-                    self._save()
-                    break
+            item = self._index.get(robot_id)
+            if item is not None:
+                # Called on every status check; persisted by flush() (or the next real change) instead.
+                item["last_seen"] = at.isoformat()
+                self._seen_dirty = True
 
-    def _to_robot(self, data: Dict) -> Robot:
-        calib_path = _calibration_path(data)
-        return Robot(
+    def flush(self) -> None:
+        """Write pending changes (including last_seen updates) to disk now, if any; raises if the write fails."""
+        with self._lock:
+            pending = self._seen_dirty or self._dirty.is_set()
+        if pending:
+            self._write()
+
+    def _flush_at_exit(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            # Too late to retry; at least say the last changes were not saved.
+            logger.exception("Failed to write %s at exit; unsaved changes were lost", self.path)
+
+    def _record_datetime(self, data: Dict, key: str) -> Optional[datetime]:
+        """
+        Parsed data[key], memoized beside the records rather than in them, so they stay exactly what is
+        saved. Re-parsed when the raw value changes, which also guards against a recycled id(data).
+        """
+        raw = data.get(key)
+        memo_key = (id(data), key)
+        memo = self._parsed_datetimes.get(memo_key)
+        if memo is None or memo[0] != raw:
+            memo = (raw, _parse_datetime(raw))
+            self._parsed_datetimes[memo_key] = memo
+        return memo[1]
+
+    def _to_robot(self, data: Dict, check_calibration: bool = True) -> Robot:
+        # Records were validated on the way in (RobotCreate/RobotUpdate) and cleaned on load, so skip
+        # re-validating every field on every read. Readers pass check_calibration=False and fill it in
+        # after releasing the lock (see _fill_calibration).
+        return Robot.model_construct(
             id=data["id"],
             name=data["name"],
             model=data["model"],
             role=data["role"],
             com_port=data["com_port"],
-            has_calibration=calib_path.is_file(),
+            has_calibration=check_calibration and self._calibrations.exists(*_calibration_location(data)),
             calibration=None,
             cameras=[self._to_camera(c) for c in data.get("cameras", []) if c],
-            last_seen=_parse_datetime(data.get("last_seen")),
+            last_seen=self._record_datetime(data, "last_seen"),
         )
 
     def _to_camera(self, data: Dict) -> RobotCamera:
-        return RobotCamera(
+        # Coerced explicitly below, so constructing without validation is safe here as well.
+        return RobotCamera.model_construct(
             id=data.get("id"),
             name=data.get("name", "Camera"),
             device_id=data.get("device_id") or data.get("path") or data.get("serial_number") or data.get("id"),
@@ -195,25 +414,29 @@ class RobotStore:
             height=int(data.get("height") or 0),
             fps=float(data.get("fps") or 0),
             index=data.get("index"),
-            created_at=_parse_datetime(data.get("created_at")) or datetime.utcnow(),
+            created_at=self._record_datetime(data, "created_at") or datetime.now(timezone.utc),
         )
 
     def update(self, robot_id: str, changes: Dict[str, str]) -> Optional[Robot]:
         prior: Dict | None = None
         updated_snapshot: Dict | None = None
         with self._lock:
-            for item in self._data.get("robots", []):
-                if item.get("id") == robot_id:
-                    prior = item.copy()
-                    for key, value in changes.items():
-                        if value is None:
-                            continue
-                        item[key] = value
-                    updated_snapshot = item.copy()
-                    self._save()
-                    break
+            item = self._index.get(robot_id)
+            if item is not None:
+                prior = item.copy()
+                for key, value in changes.items():
+                    if value is None:
+                        continue
+                    item[key] = value
+                if item.get("name") != prior.get("name"):
+                    if self._names.get(str(prior.get("name") or "").lower()) == robot_id:
+                        del self._names[str(prior["name"]).lower()]
+                    self._names[str(item["name"]).lower()] = robot_id
+                updated_snapshot = item.copy()
+                self._save()
         if prior and updated_snapshot:
             self._maybe_rename_calibration(prior, updated_snapshot)
+            self._notify()
             return self._to_robot(updated_snapshot)
         return None
 
@@ -222,40 +445,40 @@ class RobotStore:
         if not record.get("id"):
             record["id"] = str(uuid.uuid4())
         with self._lock:
-            for item in self._data.get("robots", []):
-                if item.get("id") == robot_id:
-                    cameras = item.setdefault("cameras", [])
-                    # Avoid duplicates by device_id + name combo
-                    for existing in cameras:
-                        if (
-                            existing.get("device_id") == record.get("device_id")
-                            and existing.get("name") == record.get("name")
-                        ):
-                            existing.update(record)
-                            break
-                    else:
-                        cameras.append(record)
-                    self._save()
-                    return self._to_robot(item)
-        return None
+            item = self._index.get(robot_id)
+            if item is None:
+                return None
+            cameras = item.setdefault("cameras", [])
+            # Avoid duplicates by device_id + name combo
+            for existing in cameras:
+                if existing.get("device_id") == record.get("device_id") and existing.get("name") == record.get("name"):
+                    existing.update(record)
+                    break
+            else:
+                cameras.append(record)
+            self._save()
+            robot = self._to_robot(item)
+        self._notify()
+        return robot
 
     def remove_camera(self, robot_id: str, camera_id: str) -> Optional[Robot]:
         with self._lock:
-            for item in self._data.get("robots", []):
-                if item.get("id") != robot_id:
-                    continue
-                cameras = item.get("cameras", []) or []
-                new_list = [cam for cam in cameras if cam.get("id") != camera_id]
-                item["cameras"] = new_list
-                self._save()
-                return self._to_robot(item)
-        return None
+            item = self._index.get(robot_id)
+            if item is None:
+                return None
+            cameras = item.get("cameras", []) or []
+            item["cameras"] = [cam for cam in cameras if cam.get("id") != camera_id]
+            self._save()
+            robot = self._to_robot(item)
+        self._notify()
+        return robot
 
     def _remove_calibration_file(self, data: Dict) -> bool:
         path = _calibration_path(data)
         try:
             if path.is_file():
                 path.unlink()
+                self._calibrations.invalidate(path)
                 self._cleanup_empty_dirs(path.parent)
                 return True
         except OSError:
@@ -271,9 +494,9 @@ class RobotStore:
             return False
         try:
             new_path.parent.mkdir(parents=True, exist_ok=True)
-            if new_path.exists():
-                new_path.unlink()
-            shutil.move(str(old_path), str(new_path))
+            # Both live under CALIB_ROOT, so this is a same-filesystem rename that replaces any existing file.
+            os.replace(old_path, new_path)
+            self._calibrations.invalidate(old_path, new_path)
             self._cleanup_empty_dirs(old_path.parent)
             return True
         except OSError:
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
 import os
+import re
 import signal
 import subprocess
 import uuid
 from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
-from threading import Lock, Thread
+from threading import RLock, Thread
 from typing import Deque, Optional
 
 from .commands import _build_env, _find_repo_root, build_teleop_cmd
 from .models import Robot
 
+READ_CHUNK_BYTES = 65536
+# Same line breaks text-mode pipes (universal newlines) split on, so "\r" progress redraws stay separate lines.
+_LINE_BREAK = re.compile(rb"\r\n|\r|\n")
+
 
 @dataclass
 class TeleopSessionState:
@@ -20,7 +25,7 @@ class TeleopSessionState:
     leader_id: str
     follower_id: str
     logs: Deque[str] = field(default_factory=lambda: deque(maxlen=600))
-    process: Optional[subprocess.Popen[str]] = None
+    process: Optional[subprocess.Popen[bytes]] = None
     running: bool = False
     return_code: Optional[int] = None
     dry_run: bool = False
@@ -44,7 +49,8 @@ class TeleopManager:
     def __init__(self) -> None:
         self._sessions: dict[str, TeleopSessionState] = {}
         self._active_session_id: str | None = None
-        self._lock = Lock()
+        # Reentrant so start() can check and claim the active slot in one critical section via active()/_store().
+        self._lock = RLock()
 
     def _store(self, state: TeleopSessionState) -> None:
         with self._lock:
@@ -61,12 +67,6 @@ class TeleopManager:
             return self._sessions.get(self._active_session_id)
 
     def start(self, leader: Robot, follower: Robot, *, dry_run: bool = False) -> tuple[bool, str, TeleopSessionState]:
-        current = self.active()
-        if current and current.running:
-            if current.leader_id == leader.id and current.follower_id == follower.id:
-                return True, "Teleop already running.", current
-            return False, "Another teleop session is already running. Stop it first.", current
-
         session_id = uuid.uuid4().hex
         cmd = build_teleop_cmd(leader, follower)
         readable = subprocess.list2cmdline(cmd) if os.name == "nt" else " ".join(cmd)
@@ -80,47 +80,51 @@ class TeleopManager:
             readable_cmd=readable,
         )
 
-        state.logs.append(f"Starting: {readable}")
-        self._store(state)
-        with self._lock:
-            self._active_session_id = state.id
+        if not dry_run:
+            env = _build_env()
+            cwd = _find_repo_root() or Path.cwd()
+            env["PYTHONUNBUFFERED"] = "1"
 
-        if dry_run:
-            state.logs.append("[dry-run] Teleop request accepted (no process started).")
-            state.return_code = 0
-            state.running = False
-            return True, "Dry-run teleop accepted.", state
-
-        env = _build_env()
-        cwd = _find_repo_root() or Path.cwd()
-        env["PYTHONUNBUFFERED"] = "1"
+            popen_kwargs: dict = {}
+            if os.name == "nt":
+                popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+            else:
+                popen_kwargs["start_new_session"] = True
 
-        popen_kwargs: dict = {}
-        if os.name == "nt":
-            popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
-        else:
-            popen_kwargs["start_new_session"] = True
+        with self._lock:
+            # Check, claim and spawn together: two concurrent starts can't both spawn a process, and stop()
+            # never sees a claimed session whose process doesn't exist yet.
+            current = self.active()
+            if current and current.running:
+                if current.leader_id == leader.id and current.follower_id == follower.id:
+                    return True, "Teleop already running.", current
+                return False, "Another teleop session is already running. Stop it first.", current
+            state.logs.append(f"Starting: {readable}")
+            self._store(state)
+            self._active_session_id = state.id
 
-        try:
-            process = subprocess.Popen(
-                cmd,
-                env=env,
-                cwd=cwd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                **popen_kwargs,
-            )
-        except Exception as exc:
-            state.logs.append(f"Failed to start teleop: {exc}")
-            state.return_code = -1
-            state.running = False
-            return False, str(exc), state
+            if dry_run:
+                state.logs.append("[dry-run] Teleop request accepted (no process started).")
+                state.return_code = 0
+                return True, "Dry-run teleop accepted.", state
 
-        state.process = process
-        state.running = True
-        state.logs.append(f"Teleop process started (pid={process.pid}).")
+            try:
+                process = subprocess.Popen(
+                    cmd,
+                    env=env,
+                    cwd=cwd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    **popen_kwargs,
+                )
+            except Exception as exc:
+                state.logs.append(f"Failed to start teleop: {exc}")
+                state.return_code = -1
+                return False, str(exc), state
+
+            state.process = process
+            state.running = True
+            state.logs.append(f"Teleop process started (pid={process.pid}).")
 
         Thread(target=self._consume_output, args=(state,), daemon=True).start()
         Thread(target=self._watch_process, args=(state,), daemon=True).start()
@@ -129,11 +133,19 @@ class TeleopManager:
     def _consume_output(self, state: TeleopSessionState) -> None:
         if not state.process or not state.process.stdout:
             return
+        stdout = state.process.stdout
+        tail = b""
         try:
-            for line in state.process.stdout:
-                clean = (line or "").rstrip("\r\n")
-                if clean:
-                    state.logs.append(clean)
+            while True:
+                # read1 returns whatever is buffered (at least one byte), so bursts come in a few chunks
+                # and each chunk's lines go into the deque with one extend.
+                chunk = stdout.read1(READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                *complete, tail = _LINE_BREAK.split(tail + chunk)
+                state.logs.extend(line.decode("utf-8", "replace") for line in complete if line)
+            if tail:
+                state.logs.append(tail.decode("utf-8", "replace"))
         except Exception as exc:
             state.logs.append(f"[panel] output reader stopped: {exc}")
         finally:
@@ -206,7 +218,7 @@ class TeleopManager:
                 self._active_session_id = None
         return True, f"Stopped teleop (code={state.return_code}).", state
 
-    def _send_interrupt(self, proc: subprocess.Popen[str]) -> bool:
+    def _send_interrupt(self, proc: subprocess.Popen[bytes]) -> bool:
         try:
             if os.name == "nt":
                 proc.send_signal(signal.CTRL_BREAK_EVENT)
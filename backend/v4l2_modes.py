@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import os
+import struct
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# Raw V4L2 capability enumeration (Linux only). One ioctl per format/size/interval replaces the
+# set-size / sleep / read-back guessing loop OpenCV needs.
+
+_V4L2_BUF_TYPE_VIDEO_CAPTURE = 1
+_V4L2_FRMSIZE_TYPE_DISCRETE = 1
+_V4L2_FRMIVAL_TYPE_DISCRETE = 1
+
+# struct v4l2_fmtdesc: index, type, flags, description[32], pixelformat, mbus_code, reserved[3]
+_FMTDESC = struct.Struct("=III32sII3I")
+# struct v4l2_frmsizeenum: index, pixel_format, type, union (6 x u32), reserved[2]
+_FRMSIZE = struct.Struct("=III6I2I")
+# struct v4l2_frmivalenum: index, pixel_format, width, height, type, union (6 x u32), reserved[2]
+_FRMIVAL = struct.Struct("=IIIII6I2I")
+
+
+def _iowr(nr: int, size: int) -> int:
+    return (3 << 30) | (size << 16) | (ord("V") << 8) | nr
+
+
+VIDIOC_ENUM_FMT = _iowr(2, _FMTDESC.size)
+VIDIOC_ENUM_FRAMESIZES = _iowr(74, _FRMSIZE.size)
+VIDIOC_ENUM_FRAMEINTERVALS = _iowr(75, _FRMIVAL.size)
+
+
+def device_node(path: Optional[str], index: Optional[int]) -> Optional[str]:
+    if path and path.startswith("/dev/"):
+        return path
+    if index is not None:
+        return f"/dev/video{index}"
+    return None
+
+
+def _pixel_formats(fcntl, fd: int) -> List[int]:
+    formats: List[int] = []
+    idx = 0
+    while True:
+        buf = bytearray(_FMTDESC.pack(idx, _V4L2_BUF_TYPE_VIDEO_CAPTURE, 0, b"", 0, 0, 0, 0, 0))
+        try:
+            fcntl.ioctl(fd, VIDIOC_ENUM_FMT, buf)
+        except OSError:
+            return formats
+        formats.append(_FMTDESC.unpack(buf)[4])
+        idx += 1
+
+
+def _frame_sizes(fcntl, fd: int, pixfmt: int, candidates: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    sizes: List[Tuple[int, int]] = []
+    idx = 0
+    while True:
+        buf = bytearray(_FRMSIZE.pack(idx, pixfmt, 0, 0, 0, 0, 0, 0, 0, 0, 0))
+        try:
+            fcntl.ioctl(fd, VIDIOC_ENUM_FRAMESIZES, buf)
+        except OSError:
+            return sizes
+        fields = _FRMSIZE.unpack(buf)
+        if fields[2] == _V4L2_FRMSIZE_TYPE_DISCRETE:
+            sizes.append((fields[3], fields[4]))
+        else:
+            # Continuous/stepwise ranges are reported once; keep the common modes that fit in the range.
+            min_w, max_w, step_w, min_h, max_h, step_h = fields[3:9]
+            for w, h in candidates:
+                if not (min_w <= w <= max_w and min_h <= h <= max_h):
+                    continue
+                if (step_w and (w - min_w) % step_w) or (step_h and (h - min_h) % step_h):
+                    continue
+                sizes.append((w, h))
+            return sizes
+        idx += 1
+
+
+def _max_fps(fcntl, fd: int, pixfmt: int, width: int, height: int) -> float:
+    best = 0.0
+    idx = 0
+    while True:
+        buf = bytearray(_FRMIVAL.pack(idx, pixfmt, width, height, 0, 0, 0, 0, 0, 0, 0, 0, 0))
+        try:
+            fcntl.ioctl(fd, VIDIOC_ENUM_FRAMEINTERVALS, buf)
+        except OSError:
+            return best
+        fields = _FRMIVAL.unpack(buf)
+        # Discrete: fract at [5:7]. Stepwise: min interval (= max fps) is also the first fract.
+        numerator, denominator = fields[5], fields[6]
+        if numerator:
+            best = max(best, denominator / numerator)
+        if fields[4] != _V4L2_FRMIVAL_TYPE_DISCRETE:
+            return best
+        idx += 1
+
+
+def enumerate_modes(node: str, candidates: List[Tuple[int, int]]) -> Optional[List[Tuple[int, int, float]]]:
+    """
+    Return every (width, height, max fps) the V4L2 device reports across its pixel formats,
+    or None when not on Linux or the device cannot be queried.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import fcntl
+    except ImportError:
+        return None
+    try:
+        fd = os.open(node, os.O_RDWR | os.O_NONBLOCK)
+    except OSError:
+        return None
+
+    modes: Dict[Tuple[int, int], float] = {}
+    try:
+        for pixfmt in _pixel_formats(fcntl, fd):
+            for w, h in _frame_sizes(fcntl, fd, pixfmt, candidates):
+                fps = _max_fps(fcntl, fd, pixfmt, w, h)
+                if (w, h) not in modes or fps > modes[(w, h)]:
+                    modes[(w, h)] = fps
+    finally:
+        os.close(fd)
+    if not modes:
+        return None
+    return [(w, h, fps) for (w, h), fps in modes.items()]
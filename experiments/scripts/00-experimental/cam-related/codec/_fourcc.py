@@ -0,0 +1,6 @@
+# Shared by the codec report scripts in this folder (run them from here so the import resolves).
+
+
+def fourcc_to_str(v):
+    """Four-character code from the CAP_PROP_FOURCC float; bytes outside ASCII map to latin-1 like chr()."""
+    return (int(v) & 0xFFFFFFFF).to_bytes(4, "little").decode("latin-1")
@@ -1,5 +1,11 @@
+import argparse
+
 import cv2
+import statistics
 import time
+from collections import deque
+
+from _fourcc import fourcc_to_str
 
 BACKEND = cv2.CAP_DSHOW  # backend that worked for you
 
@@ -11,71 +17,86 @@ MODES = [
 FPS_LIST = [60]
 FOURCCS = ["MJPG", "YUY2"]
 
-def fourcc_to_str(v):
-    i = int(v)
-    return "".join([
-        chr((i >> 0) & 0xFF),
-        chr((i >> 8) & 0xFF),
-        chr((i >> 16) & 0xFF),
-        chr((i >> 24) & 0xFF),
-    ])
-
-def measure_fps(cap, seconds=2.0, warmup=10):
+# Returns early once the last `window` frame intervals agree within rel_stddev; `seconds` is the cap.
+def measure_fps(cap, seconds=2.0, warmup=10, window=30, rel_stddev=0.05):
     for _ in range(warmup):
-        ok, _ = cap.read()
+        ok = cap.grab()
         if not ok:
             return 0.0
     n = 0
-    t0 = time.perf_counter()
-    while time.perf_counter() - t0 < seconds:
-        ok, _ = cap.read()
+    intervals = deque(maxlen=window)
+    t0 = last = time.perf_counter()
+    while last - t0 < seconds:
+        ok = cap.grab()
+        now = time.perf_counter()
         if not ok:
             break
         n += 1
+        intervals.append(now - last)
+        last = now
+        if len(intervals) == window:
+            mean = statistics.fmean(intervals)
+            if mean > 0 and statistics.pstdev(intervals, mean) / mean < rel_stddev:
+                return 1.0 / mean
     dt = time.perf_counter() - t0
     return n / dt if dt > 0 else 0.0
 
-def test_mode(cam_idx, label, w, h, fps, fourcc):
-    print(f"\nTrying cam={cam_idx} {label} {w}x{h}@{fps} req={fourcc}", flush=True)
+# With trust_reported, a sane driver-advertised rate stands in for the multi-second measurement.
+def get_or_measure_fps(cap, rep_fps, trust_reported=False):
+    if trust_reported and 1 < rep_fps < 240:
+        return rep_fps, "reported"
+    return measure_fps(cap), "measured"
 
+# Opens the camera once for all (label, w, h, fps, fourcc) modes: reopening costs 0.5-2 s on
+# DShow/MSMF. The read-back after each switch shows whether the driver took the new mode.
+def probe_one_cam(cam_idx, modes, trust_reported=False):
     cap = cv2.VideoCapture(cam_idx, BACKEND)
     if not cap.isOpened():
-        print("  -> OPEN FAILED", flush=True)
+        print(f"\ncam={cam_idx} -> OPEN FAILED", flush=True)
         return
 
-    # IMPORTANT: set FOURCC last
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH,  w)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
-    cap.set(cv2.CAP_PROP_FPS,          fps)
-    cap.set(cv2.CAP_PROP_FOURCC,       cv2.VideoWriter_fourcc(*fourcc))
-
     try:
         cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
     except Exception:
         pass
 
-    got_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    got_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    got_fourcc = fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC))
-    rep_fps = float(cap.get(cv2.CAP_PROP_FPS))
-
-    real_fps = measure_fps(cap)
-
-    cap.release()
-
-    print(
-        f"  -> got {got_w}x{got_h} {got_fourcc} "
-        f"rep_fps={rep_fps:.1f} measured_fps={real_fps:.1f}",
-        flush=True
-    )
+    try:
+        for label, w, h, fps, fourcc in modes:
+            print(f"\nTrying cam={cam_idx} {label} {w}x{h}@{fps} req={fourcc}", flush=True)
+
+            # IMPORTANT: set FOURCC last
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH,  w)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
+            cap.set(cv2.CAP_PROP_FPS,          fps)
+            cap.set(cv2.CAP_PROP_FOURCC,       cv2.VideoWriter_fourcc(*fourcc))
+
+            got_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            got_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            got_fourcc = fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC))
+            rep_fps = float(cap.get(cv2.CAP_PROP_FPS))
+
+            real_fps, source = get_or_measure_fps(cap, rep_fps, trust_reported)
+
+            print(
+                f"  -> got {got_w}x{got_h} {got_fourcc} "
+                f"rep_fps={rep_fps:.1f} {source}_fps={real_fps:.1f}",
+                flush=True
+            )
+    finally:
+        cap.release()
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fast", action="store_true", help="trust CAP_PROP_FPS when it looks sane instead of measuring")
+    args = parser.parse_args()
+
     cam_idx = 1  # change if needed
 
-    for label, w, h in MODES:
-        for fps in FPS_LIST:
-            for fourcc in FOURCCS:
-                test_mode(cam_idx, label, w, h, fps, fourcc)
+    probe_one_cam(
+        cam_idx,
+        [(label, w, h, fps, fourcc) for label, w, h in MODES for fps in FPS_LIST for fourcc in FOURCCS],
+        trust_reported=args.fast,
+    )
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,89 @@
+# Shared by cross-reboot-index.py (same folder, so it imports directly) and usb-devices/usb_watch.py
+# (which adds this folder to sys.path).
+
+import queue
+import subprocess
+import threading
+import time
+
+# Longest a single command may take before the session is killed (e.g. input PowerShell is still waiting to complete).
+COMMAND_TIMEOUT_SECONDS = 30.0
+
+
+class PowerShellError(RuntimeError):
+    """The command ran and failed; the session itself is still usable."""
+
+
+class PowerShellSession:
+    """One powershell.exe kept open: commands go in over stdin, output is read back up to a sentinel line."""
+
+    SENTINEL = "__END_OF_COMMAND__"
+
+    def __init__(self):
+        self._process = None
+        self._lines = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        self._process = subprocess.Popen(
+            ["powershell", "-NoLogo", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass", "-Command", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+        )
+        self._process.stdin.write("[Console]::OutputEncoding = [System.Text.Encoding]::UTF8\n")
+        # Lines are read on a thread so run() can stop waiting at its deadline.
+        self._lines = queue.Queue()
+        threading.Thread(target=self._read_lines, args=(self._process.stdout, self._lines), daemon=True).start()
+
+    @staticmethod
+    def _read_lines(stdout, lines):
+        for line in stdout:
+            lines.put(line.rstrip("\r\n"))
+        lines.put(None)
+
+    def _kill(self):
+        try:
+            self._process.kill()
+        except OSError:
+            pass
+        self._process = None
+
+    def run(self, cmd: str, timeout: float = COMMAND_TIMEOUT_SECONDS) -> str:
+        """
+        Run one single-line command and return its stdout. Raises PowerShellError when the command fails
+        (errors are made terminating for it), RuntimeError when the session dies or the command times out.
+        """
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+            # Separate input lines, so the sentinel is printed even when the command doesn't parse; the
+            # sentinel line carries the error message, if any.
+            self._process.stdin.write(
+                "$__error = 'command did not run'\n"
+                f"try {{ & {{ $ErrorActionPreference = 'Stop'; {cmd} }}; $__error = $null }} "
+                "catch { $__error = \"$_\" -replace '\\s+', ' ' }\n"
+                f"Write-Output ('{self.SENTINEL} ' + $__error)\n"
+            )
+            self._process.stdin.flush()
+            deadline = time.monotonic() + timeout
+            lines = []
+            while True:
+                try:
+                    line = self._lines.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    self._kill()
+                    raise RuntimeError(f"PowerShell command timed out after {timeout:g}s")
+                if line is None:
+                    self._process = None
+                    raise RuntimeError("PowerShell session exited")
+                if line.startswith(self.SENTINEL):
+                    error = line[len(self.SENTINEL):].strip()
+                    if error:
+                        raise PowerShellError(error)
+                    return "\n".join(lines).strip()
+                lines.append(line)
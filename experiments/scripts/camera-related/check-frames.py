@@ -1,4 +1,4 @@
-import cv2, time, os
+import cv2, os
 
 def open_cam(idx, w=1280, h=720, fps=20):
     cap = cv2.VideoCapture(idx, cv2.CAP_DSHOW)
@@ -19,9 +19,9 @@ def open_cam(idx, w=1280, h=720, fps=20):
 cam_idx = 1
 cap = open_cam(cam_idx)
 
-# warmup
+# warmup (grab only; no need to decode frames we discard)
 for _ in range(30):
-    cap.read()
+    cap.grab()
 
 ok, frame = cap.read()
 print("read ok?", ok, "frame is None?", frame is None)
@@ -1,3 +1,4 @@
+import functools
 import json
 import re
 import subprocess
@@ -6,16 +7,34 @@ from pathlib import Path
 import cv2
 from cv2_enumerate_cameras import enumerate_cameras
 
+from _powershell import PowerShellError, PowerShellSession
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
 CONFIG_PATH = Path("saved_camera.json")
 
 GUID_RE = re.compile(
     r"^\{?[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\}?$"
 )
 
-USB_PATH_RE = re.compile(r"(?:^|\\\\\?\\)usb#([^#]+)#([^#]+)#", re.IGNORECASE)
+# Matches with or without the \\?\ prefix DirectShow usually puts in front.
+USB_PATH_RE = re.compile(r"usb#([^#]+)#([^#]+)#", re.IGNORECASE)
+
+
+_PS = PowerShellSession()
 
 
 def run_ps(cmd: str) -> str:
+    """Run cmd in the shared PowerShell session (one startup per script run), or a one-off process if that fails."""
+    try:
+        return _PS.run(cmd)
+    except PowerShellError:
+        raise  # the command failed; running it again in a fresh process won't help
+    except (OSError, RuntimeError):
+        pass
     return subprocess.check_output(
         ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", cmd],
         text=True,
@@ -24,15 +43,12 @@ def run_ps(cmd: str) -> str:
     ).strip()
 
 
+@functools.lru_cache(maxsize=128)
 def dshow_path_to_instance_id(path: str) -> str:
     if not path:
         raise ValueError("Empty DirectShow path")
 
-    m = USB_PATH_RE.search(path.strip())
-    if not m:
-        # fallback if string doesn't include the \\?\ prefix
-        m = re.search(r"usb#([^#]+)#([^#]+)#", path.strip(), re.IGNORECASE)
-    if not m:
+    if not (m := USB_PATH_RE.search(path)):
         raise ValueError(f"Could not parse USB instance tokens from: {path}")
 
     part1, part2 = m.group(1), m.group(2)
@@ -48,8 +64,11 @@ def container_id_from_instance_id(instance_id: str) -> str:
         f"'HKLM:\\SYSTEM\\CurrentControlSet\\Enum\\{instance_id}' "
         "-Name ContainerID).ContainerID"
     )
-    out = run_ps(ps).strip()
+    return check_container_id(instance_id, run_ps(ps))
+
 
+def check_container_id(instance_id: str, out: str) -> str:
+    out = (out or "").strip()
     if not out:
         raise RuntimeError(f"No ContainerID found in registry for {instance_id}")
     if not GUID_RE.match(out):
@@ -58,6 +77,35 @@ def container_id_from_instance_id(instance_id: str) -> str:
     return out
 
 
+def container_ids_from_instance_ids(instance_ids: list[str]) -> dict:
+    """Look up every ContainerID in one PowerShell call; ids without a registry entry are left out."""
+    ids = sorted({i for i in instance_ids if i and i.lower() != "none"})
+    if not ids:
+        return {}
+
+    quoted = ",".join("'" + i.replace("'", "''") + "'" for i in ids)
+    ps = (
+        f"$out = @{{}}; foreach ($id in @({quoted})) {{ try {{ "
+        "$out[$id] = [string](Get-ItemProperty -Path ('HKLM:\\SYSTEM\\CurrentControlSet\\Enum\\' + $id) "
+        "-Name ContainerID -ErrorAction Stop).ContainerID "
+        "} catch {} }; $out | ConvertTo-Json -Compress"
+    )
+    data = json.loads(run_ps(ps) or "{}")
+    return {key.upper(): value for key, value in (data or {}).items()}
+
+
+def read_config(path: Path) -> dict:
+    data = path.read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data.decode("utf-8"))
+
+
+def write_config(path: Path, payload: dict) -> None:
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
 def cameras():
     """Return list of cameras from cv2_enumerate_cameras (CAP_DSHOW)."""
     return [
@@ -72,16 +120,22 @@ def cameras():
     ]
 
 
-def enrich(cam: dict) -> dict:
-    """Add instance_id + container_id if possible (best effort)."""
-    path = cam.get("path", "")
+def instance_id_or_none(cam: dict):
+    try:
+        return dshow_path_to_instance_id(cam.get("path", ""))
+    except ValueError:
+        return None
+
+
+def enrich(cam: dict, container_ids: dict) -> dict:
+    """Add instance_id + container_id if possible (best effort), from a container_ids_from_instance_ids() result."""
     cam = {**cam, "instance_id": None, "container_id": None}
-    if not path:
+    iid = instance_id_or_none(cam)
+    if not iid:
         return cam
 
     try:
-        iid = dshow_path_to_instance_id(path)
-        cid = container_id_from_instance_id(iid)
+        cid = check_container_id(iid, container_ids.get(iid, ""))
         cam["instance_id"] = iid
         cam["container_id"] = cid
     except Exception:
@@ -90,8 +144,20 @@ def enrich(cam: dict) -> dict:
     return cam
 
 
+def enriched_cameras(cams=None) -> list:
+    """cameras() (or the given subset) with instance/container ids, using one PowerShell roundtrip for all of them."""
+    cams = cameras() if cams is None else cams
+    if not cams:
+        return []
+    try:
+        container_ids = container_ids_from_instance_ids([instance_id_or_none(c) for c in cams])
+    except Exception:
+        container_ids = {}
+    return [enrich(c, container_ids) for c in cams]
+
+
 def list_cams():
-    cams = [enrich(c) for c in cameras()]
+    cams = enriched_cameras()
     if not cams:
         print("No cameras found.")
         return
@@ -110,7 +176,7 @@ def list_cams():
 
 
 def save_cam():
-    cams = [enrich(c) for c in cameras()]
+    cams = enriched_cameras()
     if not cams:
         print("No cameras found.")
         return
@@ -149,7 +215,7 @@ def save_cam():
         "saved_pid": cam["pid"],
         "saved_container_id": cam["container_id"],
     }
-    CONFIG_PATH.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    write_config(CONFIG_PATH, payload)
 
     print("\n✅ Saved camera:")
     print(json.dumps(payload, indent=2))
@@ -161,10 +227,16 @@ def resolve_index():
         print(f"No {CONFIG_PATH} found. Save a camera first.")
         return None
 
-    saved = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
+    saved = read_config(CONFIG_PATH)
     saved_container = str(saved.get("saved_container_id", "")).strip().lower()
 
-    for cam in (enrich(c) for c in cameras()):
+    # Only cameras of the saved model can match; skip the registry lookup for the rest (or entirely).
+    candidates = [
+        c
+        for c in cameras()
+        if saved.get("saved_vid") in (None, c["vid"]) and saved.get("saved_pid") in (None, c["pid"])
+    ]
+    for cam in enriched_cameras(candidates):
         cid = cam.get("container_id")
         if cid and cid.strip().lower() == saved_container:
             return cam["index"]
@@ -1,16 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
 from cv2_enumerate_cameras import enumerate_cameras
 
 def dump(backend, name):
-    print(f"\n=== {name} ===")
+    # Returns the report instead of printing it, so both backends can enumerate at once.
+    lines = [f"\n=== {name} ==="]
     cams = list(enumerate_cameras(backend))
     if not cams:
-        print("No cameras found.")
-        return
+        lines.append("No cameras found.")
+        return "\n".join(lines)
     for c in cams:
-        print(f"index={c.index}  name={c.name}")
-        print(f"  vid={c.vid} pid={c.pid}")
-        print(f"  path={c.path}\n")
+        lines.append(f"index={c.index}  name={c.name}")
+        lines.append(f"  vid={c.vid} pid={c.pid}")
+        lines.append(f"  path={c.path}\n")
+    return "\n".join(lines)
+
+BACKENDS = [(cv2.CAP_MSMF, "CAP_MSMF"), (cv2.CAP_DSHOW, "CAP_DSHOW")]
 
-dump(cv2.CAP_MSMF, "CAP_MSMF")
-dump(cv2.CAP_DSHOW, "CAP_DSHOW")
+# Enumeration only lists devices (nothing is opened), so MSMF and DirectShow can run side by side.
+with ThreadPoolExecutor(len(BACKENDS)) as pool:
+    for report in pool.map(lambda b: dump(*b), BACKENDS):
+        print(report)
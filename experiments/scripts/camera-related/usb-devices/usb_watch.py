@@ -4,25 +4,87 @@ Watch for USB devices that connect or disconnect after the script starts.
 The script takes a snapshot of currently present USB devices and then reports
 only changes (connections/disconnections) that happen afterwards.
 Requires PowerShell and the Get-PnpDevice cmdlet (available on Windows 10+).
+
+A single PowerShell process stays open and waits on Win32_DeviceChangeEvent,
+printing a fresh device list only when Windows reports a change. If that
+watcher can't run, the script falls back to polling once per POLL_SECONDS.
 """
 
 import json
 import subprocess
 import sys
 import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from _powershell import PowerShellError, PowerShellSession  # noqa: E402
 
 
 POLL_SECONDS = 1.0
+# Device change events arrive in bursts (one per interface); wait this long and drop the rest of the burst.
+SETTLE_MILLISECONDS = 250
+
+LIST_USB_DEVICES = (
+    "@(Get-PnpDevice -PresentOnly "
+    "| Where-Object { $_.InstanceId -like 'USB*' } "
+    "| Select-Object InstanceId, FriendlyName)"
+)
+
+# Emits one compressed JSON list per line: at startup, then after each settled burst of change events.
+WATCH_SCRIPT = f"""
+[Console]::OutputEncoding = [System.Text.Encoding]::UTF8
+# Any failure (e.g. Register-WmiEvent being denied) ends the script, so the caller falls back to polling
+# instead of waiting on an event that was never registered.
+$ErrorActionPreference = 'Stop'
+function Emit {{
+    ConvertTo-Json -InputObject {LIST_USB_DEVICES} -Depth 2 -Compress
+    [Console]::Out.Flush()
+}}
+Register-WmiEvent -Class Win32_DeviceChangeEvent -SourceIdentifier UsbWatch | Out-Null
+Emit
+while ($true) {{
+    Wait-Event -SourceIdentifier UsbWatch | Out-Null
+    Start-Sleep -Milliseconds {SETTLE_MILLISECONDS}
+    Get-Event -SourceIdentifier UsbWatch -ErrorAction SilentlyContinue | Remove-Event
+    Emit
+}}
+"""
+
+
+def parse_devices(output):
+    """Turn ConvertTo-Json output into a dict mapping instance id -> friendly name."""
+    data = json.loads(output.strip() or "[]")
+
+    if isinstance(data, dict):  # Convert single-object JSON to a list for uniformity.
+        data = [data]
+
+    devices = {}
+    for item in data or []:
+        instance_id = item.get("InstanceId")
+        if not instance_id:
+            continue
+        friendly = item.get("FriendlyName") or "(unknown USB device)"
+        devices[instance_id] = friendly
+
+    return devices
+
+
+_PS = PowerShellSession()
 
 
 def fetch_usb_devices():
     """Return a dict mapping instance id -> friendly name for present USB devices."""
+    try:
+        # Polling reuses one PowerShell process instead of paying its startup every POLL_SECONDS.
+        return parse_devices(_PS.run(f"{LIST_USB_DEVICES} | ConvertTo-Json -Depth 2 -Compress"))
+    except PowerShellError:
+        raise  # the listing itself failed; an empty result would read as every device disconnecting
+    except (OSError, RuntimeError):
+        pass
+
     ps_command = (
         "[Console]::OutputEncoding = [System.Text.Encoding]::UTF8; "
-        "@(Get-PnpDevice -PresentOnly "
-        "| Where-Object { $_.InstanceId -like 'USB*' } "
-        "| Select-Object InstanceId, FriendlyName)"
-        " | ConvertTo-Json -Depth 2"
+        f"{LIST_USB_DEVICES} | ConvertTo-Json -Depth 2"
     )
 
     # Use bytes + manual decode to avoid UnicodeDecodeError on localized consoles.
@@ -36,49 +98,72 @@ def fetch_usb_devices():
         stderr_text = (result.stderr or b"").decode("utf-8", errors="replace").strip()
         raise RuntimeError(stderr_text or "PowerShell command failed")
 
-    output = (result.stdout or b"").decode("utf-8", errors="replace").strip() or "[]"
-    data = json.loads(output)
+    return parse_devices((result.stdout or b"").decode("utf-8", errors="replace"))
 
-    if isinstance(data, dict):  # Convert single-object JSON to a list for uniformity.
-        data = [data]
 
-    devices = {}
-    for item in data:
-        instance_id = item.get("InstanceId")
-        if not instance_id:
-            continue
-        friendly = item.get("FriendlyName") or "(unknown USB device)"
-        devices[instance_id] = friendly
-
-    return devices
+def watch_usb_devices():
+    """Yield the device dict from one long-lived PowerShell process: once at start, then per change."""
+    process = subprocess.Popen(
+        ["powershell", "-NoLogo", "-NoProfile", "-Command", WATCH_SCRIPT],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        for line in process.stdout:
+            yield parse_devices(line.decode("utf-8", errors="replace"))
+    finally:
+        process.kill()
+        # Read stderr once the watcher is gone; errors end the script, so it only holds the final one.
+        _, stderr = process.communicate()
+    stderr_text = (stderr or b"").decode("utf-8", errors="replace").strip()
+    raise RuntimeError(stderr_text or "PowerShell watcher exited")
+
+
+def poll_usb_devices():
+    """Yield the device dict every POLL_SECONDS, skipping failed reads."""
+    while True:
+        try:
+            yield fetch_usb_devices()
+        except Exception as exc:  # Keep running even if a read fails.
+            print(f"Error reading USB devices: {exc}", file=sys.stderr)
+        time.sleep(POLL_SECONDS)
+
+
+def report_changes(previous, current):
+    added = current.keys() - previous.keys()
+    removed = previous.keys() - current.keys()
+
+    for instance_id in sorted(added):
+        print(f"[connected] {current[instance_id]} ({instance_id})")
+
+    for instance_id in sorted(removed):
+        name = previous.get(instance_id, "(unknown USB device)")
+        print(f"[disconnected] {name} ({instance_id})")
+
+
+def follow(snapshots, seen):
+    """
+    Report changes across snapshots. seen["previous"] holds the last one seen and is updated as they
+    arrive, so it is still current if snapshots raises partway through.
+    """
+    for current in snapshots:
+        if seen["previous"] is None:
+            print(f"Ignoring {len(current)} device(s) already present.")
+        else:
+            report_changes(seen["previous"], current)
+        seen["previous"] = current
 
 
 def main():
     print("Monitoring USB devices... (press Ctrl+C to stop)")
-    baseline = fetch_usb_devices()
-    print(f"Ignoring {len(baseline)} device(s) already present.")
-    previous = baseline
-
+    seen = {"previous": None}
     try:
-        while True:
-            time.sleep(POLL_SECONDS)
-            try:
-                current = fetch_usb_devices()
-            except Exception as exc:  # Keep running even if a read fails.
-                print(f"Error reading USB devices: {exc}", file=sys.stderr)
-                continue
-
-            added = current.keys() - previous.keys()
-            removed = previous.keys() - current.keys()
-
-            for instance_id in sorted(added):
-                print(f"[connected] {current[instance_id]} ({instance_id})")
-
-            for instance_id in sorted(removed):
-                name = previous.get(instance_id, "(unknown USB device)")
-                print(f"[disconnected] {name} ({instance_id})")
-
-            previous = current
+        try:
+            follow(watch_usb_devices(), seen)
+        except Exception as exc:
+            print(f"Event watcher unavailable ({exc}); polling every {POLL_SECONDS:g}s.", file=sys.stderr)
+        # Compared against the watcher's last snapshot, so changes made around the failure still show up.
+        follow(poll_usb_devices(), seen)
     except KeyboardInterrupt:
         print("\nStopped.")
 
@@ -9,7 +9,8 @@ config = OpenCVCameraConfig(
     fps=30,
     width=1920,
     height=1080,
-    color_mode=ColorMode.RGB,
+    # OpenCV captures and displays BGR; asking lerobot for BGR skips its BGR->RGB and our RGB->BGR copy.
+    color_mode=ColorMode.BGR,
     rotation=Cv2Rotation.NO_ROTATION
 )
 
@@ -24,10 +25,7 @@ try:
         if frame is None:
             continue
 
-        # OpenCV expects BGR, lerobot gives RGB
-        frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-
-        cv2.imshow("LeRobot Camera", frame_bgr)
+        cv2.imshow("LeRobot Camera", frame)
 
         if cv2.waitKey(1) & 0xFF == ord("q"):
             break
@@ -14,7 +14,7 @@ import shlex
 import subprocess
 import sys
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Mapping
 
 
 SUPPORTED_TYPES = {
@@ -117,14 +117,13 @@ def build_command(device_type: str, port: str, name: str) -> list[str]:
     ]
 
 
-def add_repo_to_env(env: dict[str, str]) -> tuple[dict[str, str], Path | None]:
+def add_repo_to_env(env: Mapping[str, str]) -> tuple[dict[str, str] | None, Path | None]:
+    """Env with the local checkout on PYTHONPATH, or None (inherit the parent's env) when there is none."""
     repo_src = Path(__file__).resolve().parent / "lerobot" / "src"
     if repo_src.exists():
-        env = env.copy()
         existing = env.get("PYTHONPATH", "")
-        env["PYTHONPATH"] = f"{repo_src}{os.pathsep}{existing}" if existing else str(repo_src)
-        return env, repo_src.parent
-    return env, None
+        return {**env, "PYTHONPATH": f"{repo_src}{os.pathsep}{existing}" if existing else str(repo_src)}, repo_src.parent
+    return None, None
 
 
 def main() -> int:
@@ -139,6 +138,14 @@ def main() -> int:
     readable_cmd = subprocess.list2cmdline(cmd) if os.name == "nt" else " ".join(shlex.quote(c) for c in cmd)
     print(f"\nExecuting: {readable_cmd}\n")
 
+    if os.name != "nt":
+        # Become the calibrate process instead of waiting on it; Windows has no real exec, so it keeps run().
+        sys.stdout.flush()
+        os.chdir(cwd)
+        if env is None:
+            os.execv(cmd[0], cmd)
+        os.execve(cmd[0], cmd, env)
+
     try:
         result = subprocess.run(cmd, env=env, cwd=cwd)
     except KeyboardInterrupt:
@@ -272,8 +272,16 @@ export default function CalibrationPage() {
             setCalibrationWaitingForOutput(false);
             return;
           }
-          const incomingLogs = payload.logs || [];
-          setCalibrationLogs((prev) => (incomingLogs.length ? incomingLogs : prev));
+          const incomingLogs: string[] = payload.logs || [];
+          if (payload.type === "delta") {
+            // Only lines added since the previous message; keep the same window the backend keeps.
+            if (incomingLogs.length) {
+              const maxLines = payload.logs_max || 400;
+              setCalibrationLogs((prev) => [...prev, ...incomingLogs].slice(-maxLines));
+            }
+          } else {
+            setCalibrationLogs((prev) => (incomingLogs.length ? incomingLogs : prev));
+          }
           setCalibrationRunning(Boolean(payload.running));
           setCalibrationReturnCode(
             typeof payload.return_code === "number" ? payload.return_code : null
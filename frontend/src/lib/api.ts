@@ -128,12 +128,13 @@ export function probeCameraDevice(id: string): Promise<CameraProbe> {
 
 export async function fetchCameraSnapshot(
   id: string,
-  opts: { width?: number; height?: number; fps?: number } = {}
+  opts: { width?: number; height?: number; fps?: number; raw?: boolean } = {}
 ): Promise<Blob> {
   const params = new URLSearchParams();
   if (opts.width) params.set("width", String(opts.width));
   if (opts.height) params.set("height", String(opts.height));
   if (opts.fps) params.set("fps", String(opts.fps));
+  if (opts.raw) params.set("raw", "true");
   const res = await fetch(`${API_BASE}/cameras/${encodeURIComponent(id)}/snapshot?${params.toString()}`, {
     cache: "no-store",
   });